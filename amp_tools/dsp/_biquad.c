@@ -0,0 +1,46 @@
+/*
+ * _biquad.c - native DF2T biquad kernel for amp_tools.dsp.blt_biquad.
+ *
+ * Loaded through ctypes (which drops the GIL for the duration of the call),
+ * so several Python threads can filter different channels concurrently.
+ *
+ * Build next to this file:
+ *   GCC/Clang: cc -O3 -fno-math-errno -fno-trapping-math -shared -fPIC -o _biquad.so _biquad.c
+ *   MSVC:      cl /O2 /LD _biquad.c /Fe:_biquad.dll
+ *
+ * Do not add -ffast-math: on GCC < 13 it links crtfastmath.o into the shared
+ * object, which turns on flush-to-zero/denormals-are-zero for the whole Python
+ * process as soon as the library is loaded. The DF2T recurrence is serial, so
+ * there is nothing for fast-math to reassociate or vectorize anyway.
+ */
+
+#include <stddef.h>
+
+#if defined(_WIN32)
+#define BIQUAD_EXPORT __declspec(dllexport)
+#else
+#define BIQUAD_EXPORT __attribute__((visibility("default")))
+#endif
+
+#if defined(__GNUC__) || defined(__clang__)
+#define BIQUAD_HOT __attribute__((hot))
+#else
+#define BIQUAD_HOT
+#endif
+
+BIQUAD_EXPORT BIQUAD_HOT void biquad_df2t(const double *x, double *y, size_t n,
+                                          double b0, double b1, double b2,
+                                          double a1, double a2)
+{
+    register double z1 = 0.0;
+    register double z2 = 0.0;
+    size_t i;
+
+    for (i = 0; i < n; ++i) {
+        const double xn = x[i];
+        const double yn = b0 * xn + z1;
+        z1 = b1 * xn - a1 * yn + z2;
+        z2 = b2 * xn - a2 * yn;
+        y[i] = yn;
+    }
+}
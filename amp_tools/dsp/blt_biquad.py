@@ -1,7 +1,23 @@
 # blt_biquad.py
+import ctypes
+import functools
+import math
+import os
 import re
 import numpy as np
 
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; fall back to the pure-Python loop
+    njit = None
+    prange = range
+
+try:
+    from scipy.signal import lfilter, sosfilt
+except ImportError:  # scipy is optional as well
+    lfilter = None
+    sosfilt = None
+
 
 FILTER_TYPES = [
     'lowpass', 'highpass',
@@ -11,136 +27,295 @@ FILTER_TYPES = [
 ]
 
 
-def _constrain(x: float, lo: float, hi: float) -> float:
-    return lo if x < lo else (hi if x > hi else x)
+# Each builder maps the shared RBJ intermediates to raw (b0, b1, b2, a0, a1, a2).
+def _lowpass(cosw0, sinw0, alpha, A):
+    return ((1.0 - cosw0) / 2.0, 1.0 - cosw0, (1.0 - cosw0) / 2.0,
+            1.0 + alpha, -2.0 * cosw0, 1.0 - alpha)
+
+
+def _highpass(cosw0, sinw0, alpha, A):
+    return ((1.0 + cosw0) / 2.0, -(1.0 + cosw0), (1.0 + cosw0) / 2.0,
+            1.0 + alpha, -2.0 * cosw0, 1.0 - alpha)
+
+
+def _bandpass_csg(cosw0, sinw0, alpha, A):  # constant skirt gain
+    return (sinw0 / 2.0, 0.0, -sinw0 / 2.0,
+            1.0 + alpha, -2.0 * cosw0, 1.0 - alpha)
+
+
+def _bandpass_czpg(cosw0, sinw0, alpha, A):  # constant 0 dB peak gain
+    return (alpha, 0.0, -alpha,
+            1.0 + alpha, -2.0 * cosw0, 1.0 - alpha)
+
+
+def _notch(cosw0, sinw0, alpha, A):
+    return (1.0, -2.0 * cosw0, 1.0,
+            1.0 + alpha, -2.0 * cosw0, 1.0 - alpha)
+
+
+def _allpass(cosw0, sinw0, alpha, A):
+    return (1.0 - alpha, -2.0 * cosw0, 1.0 + alpha,
+            1.0 + alpha, -2.0 * cosw0, 1.0 - alpha)
+
+
+def _peaking(cosw0, sinw0, alpha, A):
+    return (1.0 + alpha * A, -2.0 * cosw0, 1.0 - alpha * A,
+            1.0 + alpha / A, -2.0 * cosw0, 1.0 - alpha / A)
+
+
+def _lowshelf(cosw0, sinw0, alpha, A):
+    k = 2.0 * A ** 0.5 * alpha
+    return (A * ((A + 1.0) - (A - 1.0) * cosw0 + k),
+            2.0 * A * ((A - 1.0) - (A + 1.0) * cosw0),
+            A * ((A + 1.0) - (A - 1.0) * cosw0 - k),
+            (A + 1.0) + (A - 1.0) * cosw0 + k,
+            -2.0 * ((A - 1.0) + (A + 1.0) * cosw0),
+            (A + 1.0) + (A - 1.0) * cosw0 - k)
+
+
+def _highshelf(cosw0, sinw0, alpha, A):
+    k = 2.0 * A ** 0.5 * alpha
+    return (A * ((A + 1.0) + (A - 1.0) * cosw0 + k),
+            -2.0 * A * ((A - 1.0) + (A + 1.0) * cosw0),
+            A * ((A + 1.0) + (A - 1.0) * cosw0 - k),
+            (A + 1.0) - (A - 1.0) * cosw0 + k,
+            2.0 * ((A - 1.0) - (A + 1.0) * cosw0),
+            (A + 1.0) - (A - 1.0) * cosw0 - k)
+
+
+_COEF_BUILDERS = {
+    'lowpass': _lowpass,
+    'highpass': _highpass,
+    'bandpass_csg': _bandpass_csg,
+    'bandpass_czpg': _bandpass_czpg,
+    'notch': _notch,
+    'allpass': _allpass,
+    'peaking': _peaking,
+    'lowshelf': _lowshelf,
+    'highshelf': _highshelf,
+}
+
+
+def _rbj_intermediates(shelf, fs, f0, Q, gain_db):
+    """Shared RBJ terms (cos w0, sin w0, alpha, A) for one band."""
+    f0 = max(0.1, f0)
+
+    w0 = 2.0 * math.pi * f0 / fs
+    cosw0 = math.cos(w0)
+    sinw0 = math.sin(w0)
+
+    A = 10.0 ** (gain_db / 40.0)
+
+    # alpha
+    if shelf:
+        # s_max = 1/(1-2/(A+1/A)) - 0.001
+        denom = (1.0 - 2.0 / (A + 1.0 / A))
+        if abs(denom) < 1e-12:
+            s_max = 1e6
+        else:
+            s_max = 1.0 / denom - 0.001
+        Q = min(max(Q, 0.001), s_max)
+        inside = (A + 1.0 / A) * (1.0 / Q - 1.0) + 2.0
+        inside = max(0.0, inside)
+        alpha = (sinw0 / 2.0) * math.sqrt(inside)
+    else:
+        alpha = sinw0 / (2.0 * max(Q, 1e-6))
+    return cosw0, sinw0, alpha, A
+
+
+@functools.lru_cache(maxsize=len(FILTER_TYPES))
+def _get_coef_fn(filter_type: str):
+    """Per-type coefficient function with the type lookup and shelf test resolved up front."""
+    builder = _COEF_BUILDERS.get(filter_type)
+    if builder is None:
+        raise ValueError(f"Unknown filter type: {filter_type}")
+
+    if filter_type in ('lowshelf', 'highshelf'):
+        def compute(fs, f0, Q, gain_db):
+            b0, b1, b2, a0, a1, a2 = builder(*_rbj_intermediates(True, fs, f0, Q, gain_db))
+            inv_a0 = 1.0 / a0
+            return (b0 * inv_a0, b1 * inv_a0, b2 * inv_a0, a1 * inv_a0, a2 * inv_a0)
+    else:
+        def compute(fs, f0, Q, gain_db):
+            # non-shelf prelude inlined: no shelf branch, no Q clamp against s_max
+            w0 = 2.0 * math.pi * max(0.1, f0) / fs
+            sinw0 = math.sin(w0)
+            b0, b1, b2, a0, a1, a2 = builder(
+                math.cos(w0), sinw0, sinw0 / (2.0 * max(Q, 1e-6)), 10.0 ** (gain_db / 40.0))
+            inv_a0 = 1.0 / a0
+            return (b0 * inv_a0, b1 * inv_a0, b2 * inv_a0, a1 * inv_a0, a2 * inv_a0)
+    return compute
 
 
 def rbj_biquad(filter_type: str, fs: float, f0: float, Q: float = 1.0, gain_db: float = 0.0):
     """
     Biquad coefficients matching the provided C implementation.
-    Returns normalized (b, a) with a[0] == 1.
+    Returns the normalized 5-tuple (b0, b1, b2, a1, a2); a0 == 1 is implied.
+    """
+    return _get_coef_fn(filter_type)(float(fs), float(f0), float(Q), float(gain_db))
+
+
+def rbj_biquad_arrays(filter_type: str, fs: float, f0: float, Q: float = 1.0, gain_db: float = 0.0):
+    """rbj_biquad as normalized (b, a) numpy arrays with a[0] == 1."""
+    b0, b1, b2, a1, a2 = rbj_biquad(filter_type, fs, f0, Q, gain_db)
+    return np.array([b0, b1, b2], dtype=float), np.array([1.0, a1, a2], dtype=float)
+
+
+def rbj_biquad_batch(filter_type: str, fs: float, f0s, Qs=1.0, gains_db=0.0):
+    """
+    Vectorized rbj_biquad for many bands of the same filter type.
+    f0s, Qs and gains_db broadcast against each other; returns (B, A) of shape (N, 3).
     """
-    f0 = max(0.1, float(f0))
+    builder = _COEF_BUILDERS.get(filter_type)
+    if builder is None:
+        raise ValueError(f"Unknown filter type: {filter_type}")
+
+    f0s, Qs, gains_db = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(f0s, dtype=np.float64)),
+        np.asarray(Qs, dtype=np.float64),
+        np.asarray(gains_db, dtype=np.float64),
+    )
+    f0s = np.maximum(f0s, 0.1)
     fs = float(fs)
-    Q = float(Q)
 
-    w0 = 2.0 * np.pi * f0 / fs
+    w0 = 2.0 * np.pi * f0s / fs
     cosw0 = np.cos(w0)
     sinw0 = np.sin(w0)
 
-    A = 10.0 ** (gain_db / 40.0)
-
-    # s_max = 1/(1-2/(A+1/A)) - 0.001
-    denom = (1.0 - 2.0 / (A + 1.0 / A))
-    if abs(denom) < 1e-12:
-        s_max = 1e6
-    else:
-        s_max = 1.0 / denom - 0.001
+    A = 10.0 ** (gains_db / 40.0)
 
-    # alpha
     if filter_type in ('lowshelf', 'highshelf'):
-        Q = _constrain(Q, 0.001, s_max)
-        inside = (A + 1.0 / A) * (1.0 / Q - 1.0) + 2.0
-        inside = max(0.0, inside)
+        denom = 1.0 - 2.0 / (A + 1.0 / A)
+        with np.errstate(divide='ignore'):
+            s_max = np.where(np.abs(denom) < 1e-12, 1e6, 1.0 / denom - 0.001)
+        Q = np.minimum(np.maximum(Qs, 0.001), s_max)
+        inside = np.maximum((A + 1.0 / A) * (1.0 / Q - 1.0) + 2.0, 0.0)
         alpha = (sinw0 / 2.0) * np.sqrt(inside)
     else:
-        alpha = sinw0 / (2.0 * max(Q, 1e-6))
+        alpha = sinw0 / (2.0 * np.maximum(Qs, 1e-6))
 
-    if filter_type == 'lowpass':
-        b0 = (1.0 - cosw0) / 2.0
-        b1 = 1.0 - cosw0
-        b2 = (1.0 - cosw0) / 2.0
-        a0 = 1.0 + alpha
-        a1 = -2.0 * cosw0
-        a2 = 1.0 - alpha
-
-    elif filter_type == 'highpass':
-        b0 = (1.0 + cosw0) / 2.0
-        b1 = -(1.0 + cosw0)
-        b2 = (1.0 + cosw0) / 2.0
-        a0 = 1.0 + alpha
-        a1 = -2.0 * cosw0
-        a2 = 1.0 - alpha
-
-    elif filter_type == 'bandpass_csg':  # constant skirt gain
-        b0 = sinw0 / 2.0
-        b1 = 0.0
-        b2 = -sinw0 / 2.0
-        a0 = 1.0 + alpha
-        a1 = -2.0 * cosw0
-        a2 = 1.0 - alpha
-
-    elif filter_type == 'bandpass_czpg':  # constant 0 dB peak gain
-        b0 = alpha
-        b1 = 0.0
-        b2 = -alpha
-        a0 = 1.0 + alpha
-        a1 = -2.0 * cosw0
-        a2 = 1.0 - alpha
-
-    elif filter_type == 'notch':
-        b0 = 1.0
-        b1 = -2.0 * cosw0
-        b2 = 1.0
-        a0 = 1.0 + alpha
-        a1 = -2.0 * cosw0
-        a2 = 1.0 - alpha
-
-    elif filter_type == 'allpass':
-        b0 = 1.0 - alpha
-        b1 = -2.0 * cosw0
-        b2 = 1.0 + alpha
-        a0 = 1.0 + alpha
-        a1 = -2.0 * cosw0
-        a2 = 1.0 - alpha
-
-    elif filter_type == 'peaking':
-        b0 = 1.0 + alpha * A
-        b1 = -2.0 * cosw0
-        b2 = 1.0 - alpha * A
-        a0 = 1.0 + alpha / A
-        a1 = -2.0 * cosw0
-        a2 = 1.0 - alpha / A
-
-    elif filter_type == 'lowshelf':
-        sqrtA = np.sqrt(A)
-        b0 = A * ((A + 1.0) - (A - 1.0) * cosw0 + 2.0 * sqrtA * alpha)
-        b1 = 2.0 * A * ((A - 1.0) - (A + 1.0) * cosw0)
-        b2 = A * ((A + 1.0) - (A - 1.0) * cosw0 - 2.0 * sqrtA * alpha)
-        a0 = (A + 1.0) + (A - 1.0) * cosw0 + 2.0 * sqrtA * alpha
-        a1 = -2.0 * ((A - 1.0) + (A + 1.0) * cosw0)
-        a2 = (A + 1.0) + (A - 1.0) * cosw0 - 2.0 * sqrtA * alpha
-
-    elif filter_type == 'highshelf':
-        sqrtA = np.sqrt(A)
-        b0 = A * ((A + 1.0) + (A - 1.0) * cosw0 + 2.0 * sqrtA * alpha)
-        b1 = -2.0 * A * ((A - 1.0) + (A + 1.0) * cosw0)
-        b2 = A * ((A + 1.0) + (A - 1.0) * cosw0 - 2.0 * sqrtA * alpha)
-        a0 = (A + 1.0) - (A - 1.0) * cosw0 + 2.0 * sqrtA * alpha
-        a1 = 2.0 * ((A - 1.0) - (A + 1.0) * cosw0)
-        a2 = (A + 1.0) - (A - 1.0) * cosw0 - 2.0 * sqrtA * alpha
-
-    else:
-        raise ValueError(f"Unknown filter type: {filter_type}")
+    b0, b1, b2, a0, a1, a2 = builder(cosw0, sinw0, alpha, A)
 
+    n = f0s.size
     inv_a0 = 1.0 / a0
-    b = np.array([b0, b1, b2], dtype=float) * inv_a0
-    a = np.array([1.0, a1 * inv_a0, a2 * inv_a0], dtype=float)
-    return b, a
+    B = np.empty((n, 3), dtype=np.float64)
+    Acoef = np.empty((n, 3), dtype=np.float64)
+    B[:, 0] = b0 * inv_a0
+    B[:, 1] = b1 * inv_a0
+    B[:, 2] = b2 * inv_a0
+    Acoef[:, 0] = 1.0
+    Acoef[:, 1] = a1 * inv_a0
+    Acoef[:, 2] = a2 * inv_a0
+    return B, Acoef
 
 
-def apply_biquad_df2t(x: np.ndarray, b: np.ndarray, a: np.ndarray) -> np.ndarray:
-    """Direct Form II Transposed biquad. a[0] must be 1."""
-    x = np.asarray(x, dtype=float)
-    y = np.empty_like(x)
+_FILTER_TYPE_IDS = {name: i for i, name in enumerate(FILTER_TYPES)}
 
-    b0, b1, b2 = float(b[0]), float(b[1]), float(b[2])
-    a1, a2 = float(a[1]), float(a[2])
 
+if njit is not None:
+    _jit = njit(cache=True, fastmath=True)
+    _rbj_intermediates_nb = _jit(_rbj_intermediates)
+    _lowpass_nb = _jit(_lowpass)
+    _highpass_nb = _jit(_highpass)
+    _bandpass_csg_nb = _jit(_bandpass_csg)
+    _bandpass_czpg_nb = _jit(_bandpass_czpg)
+    _notch_nb = _jit(_notch)
+    _allpass_nb = _jit(_allpass)
+    _peaking_nb = _jit(_peaking)
+    _lowshelf_nb = _jit(_lowshelf)
+    _highshelf_nb = _jit(_highshelf)
+
+    @njit(cache=True, fastmath=True, parallel=True)
+    def _rbj_sos_kernel(type_ids, fs, f0s, Qs, gains, out):
+        # type ids follow FILTER_TYPES order; the two shelves come last
+        for i in prange(type_ids.size):
+            t = type_ids[i]
+            cosw0, sinw0, alpha, A = _rbj_intermediates_nb(t >= 7, fs, f0s[i], Qs[i], gains[i])
+            if t == 0:
+                c = _lowpass_nb(cosw0, sinw0, alpha, A)
+            elif t == 1:
+                c = _highpass_nb(cosw0, sinw0, alpha, A)
+            elif t == 2:
+                c = _bandpass_csg_nb(cosw0, sinw0, alpha, A)
+            elif t == 3:
+                c = _bandpass_czpg_nb(cosw0, sinw0, alpha, A)
+            elif t == 4:
+                c = _notch_nb(cosw0, sinw0, alpha, A)
+            elif t == 5:
+                c = _allpass_nb(cosw0, sinw0, alpha, A)
+            elif t == 6:
+                c = _peaking_nb(cosw0, sinw0, alpha, A)
+            elif t == 7:
+                c = _lowshelf_nb(cosw0, sinw0, alpha, A)
+            else:
+                c = _highshelf_nb(cosw0, sinw0, alpha, A)
+            inv_a0 = 1.0 / c[3]
+            out[i, 0] = c[0] * inv_a0
+            out[i, 1] = c[1] * inv_a0
+            out[i, 2] = c[2] * inv_a0
+            out[i, 3] = 1.0
+            out[i, 4] = c[4] * inv_a0
+            out[i, 5] = c[5] * inv_a0
+        return out
+
+
+def rbj_biquad_sos(filter_types, fs: float, f0s, Qs=1.0, gains_db=0.0) -> np.ndarray:
+    """
+    Coefficients for N bands that may each use a different filter type.
+    Returns an (N, 6) array of rows [b0, b1, b2, 1, a1, a2] (scipy 'sos' layout).
+    """
+    if isinstance(filter_types, str):
+        filter_types = [filter_types]
+    try:
+        ids = np.array([_FILTER_TYPE_IDS[t] for t in filter_types], dtype=np.int64)
+    except KeyError as e:
+        raise ValueError(f"Unknown filter type: {e.args[0]}") from None
+
+    ids, f0s, Qs, gains_db = (np.ascontiguousarray(v) for v in np.broadcast_arrays(
+        ids,
+        np.asarray(f0s, dtype=np.float64),
+        np.asarray(Qs, dtype=np.float64),
+        np.asarray(gains_db, dtype=np.float64),
+    ))
+    out = np.empty((ids.size, 6), dtype=np.float64)
+
+    if njit is not None:
+        return _rbj_sos_kernel(ids, float(fs), f0s, Qs, gains_db, out)
+
+    for t in np.unique(ids):
+        mask = ids == t
+        B, A = rbj_biquad_batch(FILTER_TYPES[t], fs, f0s[mask], Qs[mask], gains_db[mask])
+        out[mask, :3] = B
+        out[mask, 3:] = A
+    return out
+
+
+def _load_c_kernel():
+    """Load the optional native kernel built from _biquad.c (see the build notes there)."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name in ('_biquad.so', '_biquad.dll', '_biquad.dylib'):
+        path = os.path.join(here, name)
+        if not os.path.isfile(path):
+            continue
+        try:
+            fn = ctypes.CDLL(path).biquad_df2t
+        except (OSError, AttributeError):
+            continue
+        fn.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_size_t] + [ctypes.c_double] * 5
+        fn.restype = None
+        return fn
+    return None
+
+
+# ctypes releases the GIL around CDLL calls, so this kernel can run on several threads at once
+_c_df2t = _load_c_kernel()
+
+
+def _df2t_kernel(x, b0, b1, b2, a1, a2, y):
     z1 = 0.0
     z2 = 0.0
     for i in range(x.size):
-        xn = float(x[i])
+        xn = x[i]
         yn = b0 * xn + z1
         z1 = b1 * xn - a1 * yn + z2
         z2 = b2 * xn - a2 * yn
@@ -148,24 +323,421 @@ def apply_biquad_df2t(x: np.ndarray, b: np.ndarray, a: np.ndarray) -> np.ndarray
     return y
 
 
+if njit is not None:
+    _df2t_kernel = njit(cache=True, fastmath=True, boundscheck=False)(_df2t_kernel)
+
+
+def _apply_biquad_df2t_py(x: np.ndarray, b0, b1, b2, a1, a2) -> np.ndarray:
+    # tolist() hands back native floats in one C pass, avoiding a numpy
+    # scalar -> float conversion on every sample; the output stays a plain
+    # list until a single np.array() at the end
+    y_list = []
+    append = y_list.append
+    z1 = 0.0
+    z2 = 0.0
+    for xn in x.tolist():
+        yn = b0 * xn + z1
+        z1 = b1 * xn - a1 * yn + z2
+        z2 = b2 * xn - a2 * yn
+        append(yn)
+    return np.array(y_list, dtype=np.float64)
+
+
+def _check_out(x: np.ndarray, out) -> None:
+    if out is not None and (out.shape != x.shape or out.dtype != x.dtype
+                            or not out.flags.c_contiguous):
+        raise ValueError("out must be a C-contiguous array with the shape and dtype of x")
+
+
+def _store(y: np.ndarray, out) -> np.ndarray:
+    # for backends that can only return a fresh array
+    if out is None:
+        return y
+    out[...] = y
+    return out
+
+
+def apply_biquad_df2t(x: np.ndarray, b: np.ndarray, a: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    """
+    Direct Form II Transposed biquad.
+    a is (1, a1, a2) or just (a1, a2); tuples and arrays are both accepted.
+    The result is written to out when given; out may be x itself.
+    """
+    x = np.ascontiguousarray(x, dtype=np.float64)
+    _check_out(x, out)
+
+    b0, b1, b2 = float(b[0]), float(b[1]), float(b[2])
+    a1, a2 = float(a[-2]), float(a[-1])
+
+    if _c_df2t is not None:
+        y = np.empty_like(x) if out is None else out
+        _c_df2t(x.ctypes.data, y.ctypes.data, x.size, b0, b1, b2, a1, a2)
+        return y
+    if lfilter is not None:
+        return _store(lfilter((b0, b1, b2), (1.0, a1, a2), x), out)
+    if njit is not None:
+        return _df2t_kernel(x, b0, b1, b2, a1, a2, np.empty_like(x) if out is None else out)
+    return _store(_apply_biquad_df2t_py(x, b0, b1, b2, a1, a2), out)
+
+
+def _df2t_tiled_kernel(x, b0, b1, b2, a1, a2, tile, y):
+    n = x.size
+    ntiles = (n + tile - 1) // tile
+
+    # pass 1: every tile from zero state, in parallel
+    exit_state = np.zeros((ntiles, 2))
+    for t in prange(ntiles):
+        lo = t * tile
+        hi = min(lo + tile, n)
+        z1 = 0.0
+        z2 = 0.0
+        for i in range(lo, hi):
+            xn = x[i]
+            yn = b0 * xn + z1
+            z1 = b1 * xn - a1 * yn + z2
+            z2 = b2 * xn - a2 * yn
+            y[i] = yn
+        exit_state[t, 0] = z1
+        exit_state[t, 1] = z2
+
+    # zero-input response to a unit z1 / z2 at the start of a tile; the state
+    # update without input is s' = M s with M = [[-a1, 1], [-a2, 0]]
+    h = np.empty((tile, 2))
+    p1, q1 = 1.0, 0.0
+    p2, q2 = 0.0, 1.0
+    for i in range(tile):
+        h[i, 0] = p1
+        h[i, 1] = p2
+        p1, q1 = -a1 * p1 + q1, -a2 * p1
+        p2, q2 = -a1 * p2 + q2, -a2 * p2
+    # now (p1, q1) and (p2, q2) are the columns of M^tile
+
+    # pass 2: carry the true start state from tile to tile (one 2x2 step each)
+    start = np.zeros((ntiles, 2))
+    for t in range(1, ntiles):
+        s1 = start[t - 1, 0]
+        s2 = start[t - 1, 1]
+        start[t, 0] = p1 * s1 + p2 * s2 + exit_state[t - 1, 0]
+        start[t, 1] = q1 * s1 + q2 * s2 + exit_state[t - 1, 1]
+
+    # pass 3: add each tile's zero-input response, in parallel
+    for t in prange(1, ntiles):
+        lo = t * tile
+        hi = min(lo + tile, n)
+        s1 = start[t, 0]
+        s2 = start[t, 1]
+        for i in range(lo, hi):
+            y[i] += h[i - lo, 0] * s1 + h[i - lo, 1] * s2
+    return y
+
+
+if njit is not None:
+    _df2t_tiled_kernel = njit(cache=True, fastmath=True, parallel=True)(_df2t_tiled_kernel)
+
+
+def apply_biquad_df2t_tiled(x: np.ndarray, b, a, tile: int = 1024) -> np.ndarray:
+    """
+    apply_biquad_df2t split into tiles that are filtered in parallel.
+    Each tile starts from zero state; a short serial pass then carries the real
+    state across tile edges and the zero-input response is added back per tile.
+    Needs numba; without it (or for signals of one tile) this is apply_biquad_df2t.
+    """
+    x = np.ascontiguousarray(x, dtype=np.float64)
+    if njit is None or x.size <= tile:
+        return apply_biquad_df2t(x, b, a)
+    b0, b1, b2 = float(b[0]), float(b[1]), float(b[2])
+    a1, a2 = float(a[-2]), float(a[-1])
+    return _df2t_tiled_kernel(x, b0, b1, b2, a1, a2, int(tile), np.empty_like(x))
+
+
+def _df1_feedback_kernel(w, a1, a2, y):
+    y1 = 0.0
+    y2 = 0.0
+    for i in range(w.size):
+        yn = w[i] - a1 * y1 - a2 * y2
+        y2 = y1
+        y1 = yn
+        y[i] = yn
+    return y
+
+
+if njit is not None:
+    _df1_feedback_kernel = njit(cache=True, fastmath=True, boundscheck=False)(_df1_feedback_kernel)
+
+
+def apply_biquad_df1(x: np.ndarray, b: np.ndarray, a: np.ndarray, block: int = 4096) -> np.ndarray:
+    """
+    Direct Form I biquad. a[0] must be 1.
+    The feedforward half runs as a vectorized FIR (np.convolve, one block at a
+    time), leaving only the two feedback taps in the serial recursion.
+    Matches apply_biquad_df2t up to rounding.
+    """
+    x = np.ascontiguousarray(x, dtype=np.float64)
+    taps = (float(b[0]), float(b[1]), float(b[2]))
+    a1, a2 = float(a[1]), float(a[2])
+
+    w = np.empty_like(x)
+    prev = np.zeros(2)  # x[n-2], x[n-1] carried across block edges
+    for start in range(0, x.size, block):
+        ext = np.concatenate((prev, x[start:start + block]))
+        w[start:start + ext.size - 2] = np.convolve(ext, taps, mode='valid')
+        prev = ext[-2:]
+
+    if njit is not None:
+        return _df1_feedback_kernel(w, a1, a2, np.empty_like(w))
+    if lfilter is not None:
+        return lfilter((1.0,), (1.0, a1, a2), w)
+    return _df1_feedback_kernel(w, a1, a2, np.empty_like(w))
+
+
+def _sos_df2t_kernel(x, sos, z, y):
+    # z[k] holds the (z1, z2) state of section k and is updated in place
+    K = sos.shape[0]
+    for n in range(x.size):
+        v = x[n]
+        for k in range(K):
+            yk = sos[k, 0] * v + z[k, 0]
+            z[k, 0] = sos[k, 1] * v - sos[k, 4] * yk + z[k, 1]
+            z[k, 1] = sos[k, 2] * v - sos[k, 5] * yk
+            v = yk
+        y[n] = v
+    return y
+
+
+if njit is not None:
+    _sos_df2t_kernel = njit(cache=True, fastmath=True, boundscheck=False)(_sos_df2t_kernel)
+
+
+def _sos_df2t_py(x: np.ndarray, sos: np.ndarray, z: np.ndarray) -> np.ndarray:
+    y = x.tolist()
+    state = z.tolist()
+    for (b0, b1, b2, _, a1, a2), zk in zip(sos.tolist(), state):
+        z1, z2 = zk
+        for n, xn in enumerate(y):
+            yn = b0 * xn + z1
+            z1 = b1 * xn - a1 * yn + z2
+            z2 = b2 * xn - a2 * yn
+            y[n] = yn
+        zk[0], zk[1] = z1, z2
+    z[:] = state
+    return np.array(y, dtype=x.dtype)
+
+
+def apply_sos_df2t(x: np.ndarray, sos: np.ndarray, zi: np.ndarray = None,
+                   out: np.ndarray = None) -> np.ndarray:
+    """
+    Cascade of K DF2T biquads in a single pass over x.
+    sos has shape (K, 6), rows [b0, b1, b2, 1, a1, a2] (see rbj_biquad_sos).
+    zi, if given, is a float64 (K, 2) array of per-section (z1, z2) state; it is used
+    as the initial state and overwritten with the final one, so consecutive
+    blocks of one signal can be filtered call by call.
+    The result is written to out when given; out may be x itself.
+    float32 input stays float32 (half the memory traffic); coefficients and
+    section state are always float64, which keeps low-frequency sections stable.
+    """
+    x = np.asarray(x)
+    x = np.ascontiguousarray(x, dtype=np.float32 if x.dtype == np.float32 else np.float64)
+    _check_out(x, out)
+    sos = np.ascontiguousarray(np.atleast_2d(sos), dtype=np.float64)
+    if sos.ndim != 2 or sos.shape[1] != 6:
+        raise ValueError("sos must have shape (K, 6)")
+    if zi is None:
+        z = np.zeros((sos.shape[0], 2), dtype=np.float64)
+    elif zi.shape != (sos.shape[0], 2) or zi.dtype != np.float64:
+        raise ValueError("zi must be a float64 array of shape (K, 2)")
+    else:
+        z = zi
+    if x.size == 0:  # sosfilt rejects empty input
+        return np.empty_like(x) if out is None else out
+
+    if njit is not None:
+        y = np.empty_like(x) if out is None else out
+        if z.flags.c_contiguous:
+            return _sos_df2t_kernel(x, sos, z, y)
+        zc = np.ascontiguousarray(z)
+        _sos_df2t_kernel(x, sos, zc, y)
+        z[:] = zc
+        return y
+    if sosfilt is not None:
+        y, z[:] = sosfilt(sos, x, zi=z)
+        return _store(y.astype(x.dtype, copy=False), out)
+    return _store(_sos_df2t_py(x, sos, z), out)
+
+
+def apply_sos_df2t_trimmed(x: np.ndarray, sos: np.ndarray, eps: float = 1e-9,
+                           block: int = 1024, out: np.ndarray = None) -> np.ndarray:
+    """
+    apply_sos_df2t for inputs ending in silence, e.g. impulse responses.
+    Only runs the cascade up to the last non-zero input sample, then on zero
+    input until every section state is below eps; the rest of the output is 0.
+    """
+    x = np.asarray(x)
+    x = np.ascontiguousarray(x, dtype=np.float32 if x.dtype == np.float32 else np.float64)
+    _check_out(x, out)
+    sos = np.atleast_2d(sos)
+    y = np.empty_like(x) if out is None else out
+
+    nz = np.flatnonzero(x)
+    pos = int(nz[-1]) + 1 if nz.size else 0
+    z = np.zeros((sos.shape[0], 2), dtype=np.float64)
+    apply_sos_df2t(x[:pos], sos, zi=z, out=y[:pos])
+
+    # ring out the tail on zero input, one block at a time
+    silence = np.zeros(block, dtype=x.dtype)
+    while pos < x.size and np.abs(z).max(initial=0.0) >= eps:
+        n = min(block, x.size - pos)
+        apply_sos_df2t(silence[:n], sos, zi=z, out=y[pos:pos + n])
+        pos += n
+    y[pos:] = 0.0
+    return y
+
+
+def _sos_df1_kernel(x, sos, z, y):
+    # z[k] holds (x[n-1], x[n-2], y[n-1], y[n-2]) of section k
+    K = sos.shape[0]
+    for n in range(x.size):
+        v = x[n]
+        for k in range(K):
+            yk = (sos[k, 0] * v + sos[k, 1] * z[k, 0] + sos[k, 2] * z[k, 1]
+                  - sos[k, 4] * z[k, 2] - sos[k, 5] * z[k, 3])
+            z[k, 1] = z[k, 0]
+            z[k, 0] = v
+            z[k, 3] = z[k, 2]
+            z[k, 2] = yk
+            v = yk
+        y[n] = v
+    return y
+
+
+if njit is not None:
+    _sos_df1_kernel = njit(cache=True, fastmath=True, boundscheck=False)(_sos_df1_kernel)
+
+
+def apply_sos_df1(x: np.ndarray, sos: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    """
+    Direct Form I version of apply_sos_df2t (same sos layout, single pass).
+    DF1 keeps past inputs/outputs instead of mixed internal state, which has
+    lower round-off noise for sections tuned far below fs. Without numba this
+    falls back to apply_sos_df2t.
+    """
+    if njit is None:
+        return apply_sos_df2t(x, sos, out=out)
+    x = np.asarray(x)
+    x = np.ascontiguousarray(x, dtype=np.float32 if x.dtype == np.float32 else np.float64)
+    _check_out(x, out)
+    sos = np.ascontiguousarray(np.atleast_2d(sos), dtype=np.float64)
+    if sos.ndim != 2 or sos.shape[1] != 6:
+        raise ValueError("sos must have shape (K, 6)")
+    z = np.zeros((sos.shape[0], 4), dtype=np.float64)
+    return _sos_df1_kernel(x, sos, z, np.empty_like(x) if out is None else out)
+
+
+def apply_biquad_cascade_df2t(x: np.ndarray, B: np.ndarray, A: np.ndarray) -> np.ndarray:
+    """
+    apply_sos_df2t for coefficients in (B, A) form, e.g. from rbj_biquad_batch.
+    B has shape (K, 3); A has shape (K, 3) with A[:, 0] == 1, or (K, 2) holding a1, a2.
+    """
+    B = np.atleast_2d(np.asarray(B, dtype=np.float64))
+    A = np.atleast_2d(np.asarray(A, dtype=np.float64))
+    if B.ndim != 2 or B.shape[1] != 3 or A.ndim != 2 or A.shape[0] != B.shape[0] or A.shape[1] not in (2, 3):
+        raise ValueError("B must have shape (K, 3) and A shape (K, 3) or (K, 2)")
+    sos = np.empty((B.shape[0], 6), dtype=np.float64)
+    sos[:, :3] = B
+    sos[:, 3] = 1.0
+    sos[:, 4:] = A[:, -2:]
+    return apply_sos_df2t(x, sos)
+
+
+def _df2t_bank_kernel(x, B, A, y):
+    K = B.shape[0]
+    for r in prange(x.shape[0] * K):
+        n = r // K
+        k = r % K
+        _df2t_kernel(x[n], B[k, 0], B[k, 1], B[k, 2], A[k, 1], A[k, 2], y[n, k])
+    return y
+
+
+if njit is not None:
+    _df2t_bank_kernel = njit(cache=True, fastmath=True, parallel=True)(_df2t_bank_kernel)
+
+
+def apply_biquad_df2t_bank(x: np.ndarray, B: np.ndarray, A: np.ndarray) -> np.ndarray:
+    """
+    Filterbank version of apply_biquad_df2t.
+    x has shape (..., T), B and A have shape (K, 3) with A[:, 0] == 1.
+    Every filter is applied to every signal; returns shape (..., K, T).
+    """
+    x = np.asarray(x, dtype=np.float64)
+    B = np.atleast_2d(np.asarray(B, dtype=np.float64))
+    A = np.atleast_2d(np.asarray(A, dtype=np.float64))
+    if B.shape != A.shape or B.ndim != 2 or B.shape[1] != 3:
+        raise ValueError("B and A must both have shape (K, 3)")
+
+    lead, T = x.shape[:-1], x.shape[-1]
+    K = B.shape[0]
+    xs = np.ascontiguousarray(x.reshape(-1, T))
+    y = np.empty((xs.shape[0], K, T), dtype=np.float64)
+
+    if lfilter is not None:
+        # one C call per filter, vectorized over the whole batch
+        for k in range(K):
+            y[:, k, :] = lfilter(B[k], A[k], xs, axis=-1)
+    elif njit is not None:
+        _df2t_bank_kernel(xs, B, A, y)
+    else:
+        for n in range(xs.shape[0]):
+            for k in range(K):
+                y[n, k] = _apply_biquad_df2t_py(xs[n], *B[k], *A[k, 1:])
+    return y.reshape(lead + (K, T))
+
+
+# Text made only of numbers and C/CSV punctuation can skip the tokenizing regex
+_PLAIN_NUMBERS_RE = re.compile(r'[\s0-9eE.+\-{};,]*')
+_SEPARATORS = str.maketrans('{};,', '    ')
+_NUM_RE = re.compile(r'[-+]?(?:\d+\.\d*|\.\d+|\d+)(?:[eE][-+]?\d+)?')
+
+
 def parse_numbers(text: str) -> np.ndarray:
     """Extract floats from C/CSV/space/newline formatted text (supports scientific notation)."""
-    text = text.replace('{', ' ').replace('}', ' ').replace(';', ' ')
-    pattern = r'[-+]?(?:\d+\.\d*|\.\d+|\d+)(?:[eE][-+]?\d+)?'
-    nums = re.findall(pattern, text)
+    if _PLAIN_NUMBERS_RE.fullmatch(text):
+        try:
+            # numpy converts the tokens in C; malformed tokens like "1-2" raise
+            # and fall through to the regex below, which splits them apart
+            return np.array(text.translate(_SEPARATORS).split(), dtype=float)
+        except ValueError:
+            pass
+    nums = _NUM_RE.findall(text)
     if not nums:
         return np.array([], dtype=float)
-    return np.array([float(s) for s in nums], dtype=float)
+    return np.array(nums, dtype=float)
+
+
+def iter_c_array(arr: np.ndarray, per_line: int = 8, chunk_lines: int = 8192):
+    """
+    format_c_array in pieces of at most chunk_lines rows, for incremental display.
+    Joining the yielded strings gives exactly format_c_array(arr, per_line).
+    """
+    # tolist() unboxes to native floats in C; plain sequences are taken as-is
+    vals = arr.ravel().tolist() if isinstance(arr, np.ndarray) else list(arr)
+    n = len(vals)
+    if n == 0:
+        yield "{\n};"
+        return
+    # one template per piece, every value formatted in a single % pass
+    row = "  " + ", ".join(["%.8g"] * per_line)
+    step = per_line * chunk_lines
+    sep = "{\n"
+    for start in range(0, n, step):
+        part = vals[start:start + step]
+        full, rem = divmod(len(part), per_line)
+        rows = [row] * full
+        if rem:
+            rows.append("  " + ", ".join(["%.8g"] * rem))
+        yield sep + (",\n".join(rows) % tuple(part))
+        sep = ",\n"
+    yield "\n};"
 
 
 def format_c_array(arr: np.ndarray, per_line: int = 8) -> str:
     """C style array, N floats per line, comma-separated."""
-    if arr.size == 0:
-        return "{\n};"
-    nums = [f"{float(v):.8g}" for v in arr]
-    lines = []
-    for i in range(0, len(nums), per_line):
-        chunk = nums[i:i + per_line]
-        trailing = "," if (i + per_line) < len(nums) else ""
-        lines.append("  " + ", ".join(chunk) + trailing)
-    return "{\n" + "\n".join(lines) + "\n};"
+    return "".join(iter_c_array(arr, per_line))
@@ -5,6 +5,16 @@ EQ converter inside amp_tools package.
 
 import json
 import os
+from pathlib import Path
+
+import numpy as np
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # orjson is optional; its C parser is much faster on big matrices
+    _json_loads = json.loads
+
 from PySide6.QtCore import Qt
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout,
@@ -13,6 +23,19 @@ from PySide6.QtWidgets import (
 )
 
 
+# Refuse pasted/loaded input beyond this size (characters of pasted text, bytes
+# of a loaded file) instead of freezing the GUI
+MAX_INPUT_SIZE = 16 * 1024 * 1024
+# Files larger than this are converted directly instead of being shown in the input box
+EDITOR_MAX_BYTES = 1_000_000
+
+
+GROUPBOX_STYLE = (
+    "QGroupBox { border: 1px solid #cccccc; border-radius: 4px; margin-top: 8px; padding-top: 8px; }"
+    "QGroupBox::title { subcontrol-origin: margin; left: 10px; padding: 0 3px 0 3px; }"
+)
+
+
 def format_float(v):
     return f"{float(v):.12f}"
 
@@ -31,10 +54,7 @@ class EqConverterWidget(QWidget):
 
         # Input box with consistent styling
         box_in = QGroupBox("Input (2D JSON array)  —  可拖拽 JSON 文件到这里")
-        box_in.setStyleSheet(
-            "QGroupBox { border: 1px solid #cccccc; border-radius: 4px; margin-top: 8px; padding-top: 8px; }"
-            "QGroupBox::title { subcontrol-origin: margin; left: 10px; padding: 0 3px 0 3px; }"
-        )
+        box_in.setStyleSheet(GROUPBOX_STYLE)
         v_in = QVBoxLayout(box_in)
 
         self.input_edit = QTextEdit()
@@ -57,10 +77,7 @@ class EqConverterWidget(QWidget):
 
         # Output box with consistent styling
         box_out = QGroupBox("Output (C Code)")
-        box_out.setStyleSheet(
-            "QGroupBox { border: 1px solid #cccccc; border-radius: 4px; margin-top: 8px; padding-top: 8px; }"
-            "QGroupBox::title { subcontrol-origin: margin; left: 10px; padding: 0 3px 0 3px; }"
-        )
+        box_out.setStyleSheet(GROUPBOX_STYLE)
         v_out = QVBoxLayout(box_out)
 
         self.output_edit = QTextEdit()
@@ -120,8 +137,13 @@ class EqConverterWidget(QWidget):
             QMessageBox.warning(self, "Error", f"Not a JSON file:\n{path}")
             return
         try:
-            txt = open(path, "r", encoding="utf-8").read()
-            self.input_edit.setPlainText(txt)
+            data = Path(path).read_bytes()
+            if len(data) > EDITOR_MAX_BYTES:
+                # big dumps skip the editor round-trip and are converted straight from the bytes
+                self.input_edit.clear()
+                self._convert(data)
+                return
+            self.input_edit.setPlainText(data.decode("utf-8"))
         except Exception as e:
             QMessageBox.warning(self, "Error", f"Failed to load file:\n{e}")
 
@@ -139,8 +161,16 @@ class EqConverterWidget(QWidget):
         if not txt:
             QMessageBox.warning(self, "Error", "Input is empty.")
             return
+        self._convert(txt)
+
+    def _convert(self, txt):
+        """Convert JSON text (str, or UTF-8 bytes straight from a file) to C code."""
+        if len(txt) > MAX_INPUT_SIZE:
+            unit = "bytes" if isinstance(txt, bytes) else "characters"
+            QMessageBox.warning(self, "Error", f"Input is too large ({len(txt)} {unit}).")
+            return
         try:
-            arr = json.loads(txt)
+            arr = _json_loads(txt)
         except Exception as e:
             QMessageBox.warning(self, "Error", f"Invalid JSON:\n{e}")
             return
@@ -148,23 +178,31 @@ class EqConverterWidget(QWidget):
             QMessageBox.warning(self, "Error", "Top-level JSON must be a 2D array.")
             return
 
-        rows = len(arr)
-        cols = len(arr[0])
+        # numpy checks the shape in C and rejects ragged/non-numeric rows
+        try:
+            mat = np.asarray(arr, dtype=np.float64)
+        except (TypeError, ValueError):
+            mat = None
+        if mat is None or mat.ndim != 2:
+            cols = len(arr[0])
+            bad = next((i for i, row in enumerate(arr) if not isinstance(row, list) or len(row) != cols), None)
+            if bad is not None:
+                QMessageBox.warning(self, "Error", f"Row {bad} has different column count.")
+            else:
+                QMessageBox.warning(self, "Error", "Matrix must contain only numbers.")
+            return
 
-        # 可选：检查每行列数一致，避免生成错误
-        for i, row in enumerate(arr):
-            if not isinstance(row, list) or len(row) != cols:
-                QMessageBox.warning(self, "Error", f"Row {i} has different column count.")
-                return
+        rows, cols = mat.shape
+
+        # one template for the whole matrix: every coefficient is formatted in a
+        # single % pass and the output is assembled without per-line appends
+        row_tmpl = "        {\n" + "            %.12f,\n" * cols + "        },\n"
 
         eq_switch = f"    .eq_switch = (uint8_t[]){{{','.join('1' for _ in range(rows))}}},"
-        lines = []
-        lines.append(f"    .eq_coeff = (float [][{cols}]){{")
-        for row in arr:
-            lines.append("        {")
-            for v in row:
-                lines.append(f"            {format_float(v)},")
-            lines.append("        },")
-        lines.append("    }")
-        code = eq_switch + "\n" + "\n".join(lines)
+        code = (
+            eq_switch + "\n"
+            + f"    .eq_coeff = (float [][{cols}]){{\n"
+            + (row_tmpl * rows) % tuple(mat.ravel().tolist())
+            + "    }"
+        )
         self.output_edit.setPlainText(code)
@@ -1,9 +1,10 @@
 # main.py
+import math
 import sys
 import numpy as np
 
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QIntValidator
+from PySide6.QtCore import Qt, QThread, Signal
+from PySide6.QtGui import QIntValidator, QTextCursor
 from PySide6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QPlainTextEdit, QPushButton,
     QListWidget, QListWidgetItem, QLabel, QFormLayout, QComboBox,
@@ -12,31 +13,79 @@ from PySide6.QtWidgets import (
 
 from .dsp.blt_biquad import (
     FILTER_TYPES,
-    rbj_biquad,
-    apply_biquad_df2t,
+    rbj_biquad_sos,
+    apply_sos_df1,
+    apply_sos_df2t_trimmed,
     parse_numbers,
-    format_c_array,
+    iter_c_array,
 )
 
 
 COMMON_SAMPLE_RATES = [22050, 44100, 48000, 96000, 192000]
+# default LP/HP Q (1/sqrt(2)), computed once instead of through numpy per call
+Q_BUTTERWORTH = 1.0 / math.sqrt(2.0)
+# designed biquads are cached by (type, fs, freq, Q, gain); cleared once this many are held
+COEF_CACHE_SIZE = 256
+# a lowpass/lowshelf below this fraction of fs switches the cascade to Direct Form I
+DF1_MAX_FREQ_RATIO = 0.01
+# output rows (8 values each) appended to the output box per update
+OUTPUT_CHUNK_LINES = 8192
 
 
 class FilterDescriptor:
+    __slots__ = ('type', 'freq', 'Q', 'gain', '_label')
+
     def __init__(self, type_: str = 'lowpass', freq: float = 1000.0, Q: float = None, gain: float = 0.0):
         self.type = type_
         self.freq = float(freq)
         if Q is None:
-            self.Q = float(1.0 / np.sqrt(2.0)) if type_ in ('lowpass', 'highpass') else 1.0
+            self.Q = Q_BUTTERWORTH if type_ in ('lowpass', 'highpass') else 1.0
         else:
             self.Q = float(Q)
         self.gain = float(gain)
 
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name != '_label':
+            # any field change invalidates the cached label
+            object.__setattr__(self, '_label', None)
+
     def label(self) -> str:
-        t = self.type
-        if t in ('peaking', 'lowshelf', 'highshelf'):
-            return f"{t}  f={self.freq:g}Hz  Q={self.Q:g}  g={self.gain:g}dB"
-        return f"{t}  f={self.freq:g}Hz  Q={self.Q:g}"
+        if self._label is None:
+            t = self.type
+            if t in ('peaking', 'lowshelf', 'highshelf'):
+                self._label = f"{t}  f={self.freq:g}Hz  Q={self.Q:g}  g={self.gain:g}dB"
+            else:
+                self._label = f"{t}  f={self.freq:g}Hz  Q={self.Q:g}"
+        return self._label
+
+
+class EqProcessWorker(QThread):
+    chunk_signal = Signal(str)  # next piece of the C array text, in order
+    error_signal = Signal(str)
+    finished_signal = Signal()
+
+    def __init__(self, x: np.ndarray, sos: np.ndarray, use_df1: bool):
+        super().__init__()
+        self.x = x
+        self.sos = sos
+        self.use_df1 = use_df1
+
+    def run(self):
+        try:
+            # the whole chain runs as one cascade: a single pass over the samples,
+            # written back into the freshly parsed input instead of a new buffer;
+            # on DF2T a silent tail is skipped once the filter state has died out
+            if self.use_df1:
+                y = apply_sos_df1(self.x, self.sos, out=self.x)
+            else:
+                y = apply_sos_df2t_trimmed(self.x, self.sos, out=self.x)
+            # the text goes out in pieces so the GUI thread never lays out one huge string
+            for piece in iter_c_array(y, per_line=8, chunk_lines=OUTPUT_CHUNK_LINES):
+                self.chunk_signal.emit(piece)
+        except Exception as e:
+            self.error_signal.emit(str(e))
+        self.finished_signal.emit()
 
 
 class FloatArrEqWidget(QWidget):
@@ -44,6 +93,8 @@ class FloatArrEqWidget(QWidget):
         super().__init__()
         self.setWindowTitle("Biquad Filter GUI (Library separated + SR presets + editable)")
         self.filters: list[FilterDescriptor] = []
+        self._coef_cache: dict[tuple, np.ndarray] = {}
+        self.worker = None
 
         root = QVBoxLayout(self)
 
@@ -128,7 +179,7 @@ class FloatArrEqWidget(QWidget):
         self.Q_spin = QDoubleSpinBox()
         self.Q_spin.setDecimals(6)
         self.Q_spin.setRange(0.001, 1e6)
-        self.Q_spin.setValue(1.0 / np.sqrt(2.0))
+        self.Q_spin.setValue(Q_BUTTERWORTH)
         self.Q_spin.valueChanged.connect(self.on_editor_changed)
 
         self.gain_spin = QDoubleSpinBox()
@@ -195,7 +246,7 @@ class FloatArrEqWidget(QWidget):
         # small convenience: if user switches to LP/HP and Q == 1, nudge to 0.707 (doesn't override custom values)
         if t in ('lowpass', 'highpass') and abs(self.Q_spin.value() - 1.0) < 1e-12:
             self.Q_spin.blockSignals(True)
-            self.Q_spin.setValue(1.0 / np.sqrt(2.0))
+            self.Q_spin.setValue(Q_BUTTERWORTH)
             self.Q_spin.blockSignals(False)
 
     def editor_to_filter(self) -> FilterDescriptor:
@@ -264,10 +315,8 @@ class FloatArrEqWidget(QWidget):
         self.filters[idx - 1], self.filters[idx] = self.filters[idx], self.filters[idx - 1]
         item = self.list_widget.takeItem(idx)
         self.list_widget.insertItem(idx - 1, item)
+        # the moved item keeps its text, so no labels need refreshing
         self.list_widget.setCurrentRow(idx - 1)
-        # refresh labels
-        for i, ff in enumerate(self.filters):
-            self.list_widget.item(i).setText(ff.label())
 
     def move_down(self):
         _, idx = self.current_filter()
@@ -277,14 +326,25 @@ class FloatArrEqWidget(QWidget):
         item = self.list_widget.takeItem(idx)
         self.list_widget.insertItem(idx + 1, item)
         self.list_widget.setCurrentRow(idx + 1)
-        for i, ff in enumerate(self.filters):
-            self.list_widget.item(i).setText(ff.label())
 
     def on_select_filter(self, row: int):
         if row < 0 or row >= len(self.filters):
             return
         self.set_editor_from_filter(self.filters[row])
 
+    def filter_sos(self, fs: float) -> np.ndarray:
+        """(K, 6) sos rows for the filter list; unchanged bands come from the cache."""
+        keys = [(f.type, fs, f.freq, f.Q, f.gain) for f in self.filters]
+        missing = list(dict.fromkeys(k for k in keys if k not in self._coef_cache))
+        if missing:
+            if len(self._coef_cache) + len(missing) > COEF_CACHE_SIZE:
+                self._coef_cache.clear()
+                missing = list(dict.fromkeys(keys))
+            types, _, freqs, Qs, gains = zip(*missing)
+            rows = rbj_biquad_sos(types, fs, freqs, Qs, gains)
+            self._coef_cache.update(zip(missing, rows))
+        return np.array([self._coef_cache[k] for k in keys])
+
     def on_clear(self):
         self.input_edit.clear()
         self.output_edit.clear()
@@ -313,14 +373,31 @@ class FloatArrEqWidget(QWidget):
                 )
                 return
 
-        y = x.copy()
         try:
-            for f in self.filters:
-                b, a = rbj_biquad(f.type, fs, f.freq, Q=f.Q, gain_db=f.gain)
-                y = apply_biquad_df2t(y, b, a)
+            sos = self.filter_sos(fs)
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Processing failed:\n{e}")
             return
 
-        self.output_edit.setPlainText(format_c_array(y, per_line=8))
+        # Very low LP/low-shelf corners use DF1, which has less round-off there.
+        use_df1 = any(f.type in ('lowpass', 'lowshelf') and f.freq < DF1_MAX_FREQ_RATIO * fs
+                      for f in self.filters)
+
+        self.btn_process.setEnabled(False)
+        self.output_edit.clear()
+        self.worker = EqProcessWorker(x, sos, use_df1)
+        self.worker.chunk_signal.connect(self.append_output)
+        self.worker.error_signal.connect(self.processing_failed)
+        self.worker.finished_signal.connect(self.processing_finished)
+        self.worker.start()
+
+    def append_output(self, text: str):
+        self.output_edit.moveCursor(QTextCursor.End)
+        self.output_edit.insertPlainText(text)
+
+    def processing_failed(self, msg: str):
+        self.output_edit.clear()
+        QMessageBox.critical(self, "Error", f"Processing failed:\n{msg}")
 
+    def processing_finished(self):
+        self.btn_process.setEnabled(True)
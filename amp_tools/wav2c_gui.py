@@ -3,14 +3,16 @@
 WAV -> C float array widget (moved into amp_tools package).
 """
 
+import io
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Optional
 
 import numpy as np
 import soundfile as sf
 
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QThread, Signal
 from PySide6.QtWidgets import (
     QCheckBox,
     QFileDialog,
@@ -32,10 +34,15 @@ from PySide6.QtWidgets import (
 )
 
 
+_VAR_BAD = re.compile(r"[^0-9a-zA-Z_]")
+_STARTS_DIGIT = re.compile(r"^[0-9]")
+_GUARD_BAD = re.compile(r"[^0-9A-Z_]")
+
+
 def sanitize_var_name(name: str) -> str:
     base = os.path.splitext(os.path.basename(name))[0]
-    base = re.sub(r"[^0-9a-zA-Z_]", "_", base)
-    if re.match(r"^[0-9]", base):
+    base = _VAR_BAD.sub("_", base)
+    if _STARTS_DIGIT.match(base):
         base = "_" + base
     if not base:
         base = "wav_data"
@@ -43,45 +50,133 @@ def sanitize_var_name(name: str) -> str:
 
 
 def wav_to_mono_float(path: str, max_samples: int = 0) -> tuple[np.ndarray, int]:
-    data, sr = sf.read(path, always_2d=True, dtype="float32")
-    mono = data.mean(axis=1)
-    if max_samples > 0:
-        mono = mono[:max_samples]
-    return mono, sr
+    # stream the file in blocks and mix each one straight into the output,
+    # so the interleaved multichannel buffer is never held in full and
+    # reading stops once max_samples frames are in
+    with sf.SoundFile(path) as f:
+        sr = f.samplerate
+        channels = f.channels
+        frames = f.frames
+        if max_samples > 0:
+            frames = min(frames, max_samples)
+
+        mono = np.empty(frames, dtype=np.float32)
+        pos = 0
+        for block in f.blocks(blocksize=1 << 16, frames=frames, always_2d=True, dtype="float32"):
+            out = mono[pos:pos + block.shape[0]]
+            np.sum(block, axis=1, out=out)
+            if channels > 1:
+                np.divide(out, channels, out=out)
+            pos += block.shape[0]
+    return mono[:pos], sr
+
+
+# samples formatted per write() call when streaming a header body (8 per row)
+HEADER_BLOCK_SAMPLES = 8 * 8192
+
+
+def write_c_array_header(fobj, samples: np.ndarray, sr: int, var_name: str):
+    """Write the C header for samples to a text file object, one row block at a time."""
+    header_guard = _GUARD_BAD.sub("_", var_name.upper()) + "_H"
+    samples = np.ravel(samples)
+    n = len(samples)
+    fobj.write(
+        f"#ifndef {header_guard}\n"
+        f"#define {header_guard}\n"
+        "\n"
+        "/*\n"
+        " * Generated from WAV file\n"
+        f" * Sample rate : {sr} Hz\n"
+        f" * Length      : {n} samples\n"
+        " */\n"
+        "\n"
+        "/* clang-format off */\n"
+        f"static const int {var_name}_sr = {sr};\n"
+        f"static const int {var_name}_len = {n};\n"
+        f"static const float {var_name}[] = {{\n"
+    )
+
+    # each block goes through one %-template: tolist() unboxes the samples in C
+    # and the whole block is formatted in a single pass, 8 per row
+    row = "    " + ", ".join(["%.8f"] * 8) + ",\n"
+    block_tmpl = row * (HEADER_BLOCK_SAMPLES // 8)
+    full = n - n % 8
+    for start in range(0, full, HEADER_BLOCK_SAMPLES):
+        vals = samples[start:min(start + HEADER_BLOCK_SAMPLES, full)].tolist()
+        tmpl = block_tmpl if len(vals) == HEADER_BLOCK_SAMPLES else row * (len(vals) // 8)
+        fobj.write(tmpl % tuple(vals))
+    if full < n:
+        fobj.write("    " + ", ".join(["%.8f"] * (n - full)) % tuple(samples[full:].tolist()) + ",\n")
+
+    fobj.write(
+        "};\n"
+        "/* clang-format on */\n"
+        "\n"
+        f"#endif /* {header_guard} */\n"
+    )
 
 
 def to_c_array_header(samples: np.ndarray, sr: int, var_name: str) -> str:
-    header_guard = re.sub(r"[^0-9A-Z_]", "_", var_name.upper()) + "_H"
-    lines = []
-    lines.append(f"#ifndef {header_guard}")
-    lines.append(f"#define {header_guard}")
-    lines.append("")
-    lines.append("/*")
-    lines.append(f" * Generated from WAV file")
-    lines.append(f" * Sample rate : {sr} Hz")
-    lines.append(f" * Length      : {len(samples)} samples")
-    lines.append(" */")
-    lines.append("")
-    lines.append("/* clang-format off */")
-    lines.append(f"static const int {var_name}_sr = {sr};")
-    lines.append(f"static const int {var_name}_len = {len(samples)};")
-    lines.append(f"static const float {var_name}[] = {{")
-
-    row = []
-    for i, v in enumerate(samples):
-        row.append(f"{v:.8f}")
-        if (i + 1) % 8 == 0:
-            lines.append("    " + ", ".join(row) + ",")
-            row = []
-    if row:
-        lines.append("    " + ", ".join(row) + ",")
-
-    lines.append("};")
-    lines.append("/* clang-format on */")
-    lines.append("")
-    lines.append(f"#endif /* {header_guard} */")
-    lines.append("")
-    return "\n".join(lines)
+    buf = io.StringIO()
+    write_c_array_header(buf, samples, sr, var_name)
+    return buf.getvalue()
+
+
+def header_path_for(path: str, out_dir: str) -> str:
+    """The .h file convert_wav_file writes for path."""
+    return os.path.join(out_dir, os.path.splitext(os.path.basename(path))[0] + ".h")
+
+
+def convert_wav_file(path: str, out_dir: str, max_samples: int = 0) -> str:
+    """Convert one WAV file to a .h file in out_dir; returns the written path."""
+    samples, sr = wav_to_mono_float(path, max_samples=max_samples)
+
+    os.makedirs(out_dir, exist_ok=True)
+    out_path = header_path_for(path, out_dir)
+
+    with open(out_path, "w", encoding="utf-8") as f:
+        write_c_array_header(f, samples, sr, sanitize_var_name(path))
+    return out_path
+
+
+def convert_wav_files(paths, out_dir: str, max_samples: int = 0):
+    """Convert files that share one output path, in list order; returns [(path, out_path, error)]."""
+    results = []
+    for path in paths:
+        try:
+            results.append((path, convert_wav_file(path, out_dir, max_samples), None))
+        except Exception as e:
+            results.append((path, None, e))
+    return results
+
+
+class Wav2CWorker(QThread):
+    """Runs the conversion jobs off the GUI thread; results come back as log lines."""
+    log_signal = Signal(str)
+    finished_signal = Signal(int)  # number of files converted
+
+    def __init__(self, jobs: list[tuple[str, list[str]]], max_samples: int):
+        super().__init__()
+        self.jobs = jobs  # (out_dir, paths sharing one output file)
+        self.max_samples = max_samples
+
+    def run(self):
+        ok_count = 0
+        # Decoding, mixdown and the file write release the GIL and overlap across
+        # jobs, but most of the time per file goes into the % formatting in
+        # write_c_array_header, which holds it; the pool mainly hides I/O latency
+        # and does not scale with cores.
+        with ThreadPoolExecutor(max_workers=min(len(self.jobs), os.cpu_count() or 1)) as pool:
+            futures = [pool.submit(convert_wav_files, paths, out_dir, self.max_samples)
+                       for out_dir, paths in self.jobs]
+            for fut in as_completed(futures):
+                for path, out_path, err in fut.result():
+                    if err is None:
+                        self.log_signal.emit(f"  => Saved: {out_path} ({os.path.basename(path)})")
+                        ok_count += 1
+                    else:
+                        self.log_signal.emit(f"  !! Error ({os.path.basename(path)}): {err!r}")
+        self.finished_signal.emit(ok_count)
 
 
 class WavDropList(QListWidget):
@@ -130,6 +225,8 @@ class Wav2CWidget(QWidget):
         super().__init__(parent)
 
         self.fixed_out_dir: Optional[str] = None
+        self.worker: Optional[Wav2CWorker] = None
+        self._file_count = 0
 
         main_layout = QVBoxLayout(self)
 
@@ -253,33 +350,38 @@ class Wav2CWidget(QWidget):
 
         max_samples = self.spnMaxSamples.value()
 
-        ok_count = 0
+        # Files that map to the same .h (same name from different folders into one
+        # output directory) form one job and are written one after another, so the
+        # last file in the list wins as before instead of two threads sharing the file
+        jobs = {}
         for path in files:
-            try:
-                self._log(f"Processing: {path}")
-                samples, sr = wav_to_mono_float(path, max_samples=max_samples)
-                var_name = sanitize_var_name(path)
-                code = to_c_array_header(samples, sr, var_name)
+            out_dir = self._get_outdir_for_file(path)
+            key = os.path.normcase(os.path.abspath(header_path_for(path, out_dir)))
+            jobs.setdefault(key, (out_dir, []))[1].append(path)
 
-                out_dir = self._get_outdir_for_file(path)
-                os.makedirs(out_dir, exist_ok=True)
-                out_name = os.path.splitext(os.path.basename(path))[0] + ".h"
-                out_path = os.path.join(out_dir, out_name)
-
-                with open(out_path, "w", encoding="utf-8") as f:
-                    f.write(code)
-
-                self._log(f"  => Saved: {out_path}")
-                ok_count += 1
-            except Exception as e:
-                self._log(f"  !! Error: {e!r}")
-
-        self._log(f"\nDone. {ok_count} / {len(files)} file(s) converted.")
-
-        if ok_count == len(files):
+        for out_dir, paths in jobs.values():
+            for path in paths:
+                self._log(f"Processing: {path}")
+            if len(paths) > 1:
+                self._log(f"  .. {len(paths)} files write {header_path_for(paths[0], out_dir)}; "
+                          f"converted in list order, the last one is kept")
+
+        self._file_count = len(files)
+        self.btnConvert.setEnabled(False)
+        self.worker = Wav2CWorker(list(jobs.values()), max_samples)
+        self.worker.log_signal.connect(self._log)
+        self.worker.finished_signal.connect(self._convert_finished)
+        self.worker.start()
+
+    def _convert_finished(self, ok_count: int):
+        self.btnConvert.setEnabled(True)
+        total = self._file_count
+        self._log(f"\nDone. {ok_count} / {total} file(s) converted.")
+
+        if ok_count == total:
             QMessageBox.information(self, "Done", "All files converted successfully.")
         else:
-            QMessageBox.warning(self, "Finished with errors", f"Converted {ok_count} / {len(files)} files. See log for details.")
+            QMessageBox.warning(self, "Finished with errors", f"Converted {ok_count} / {total} files. See log for details.")
 
 
 class MainWindow(QMainWindow):
@@ -5,13 +5,25 @@ import numpy as np
 import soundfile as sf
 
 
+_FLOAT_RE = re.compile(r"[-+]?\d*\.?\d+(?:[eE][-+]?\d+)?")
+# 只含数字和常见分隔符的文本可以跳过正则，直接 split 后交给 numpy
+_PLAIN_RE = re.compile(r"[\s0-9eE.+\-,;{}\[\]]*")
+_DOT_EXP_RE = re.compile(r"\.[eE]")  # "1.e5" 会被上面的正则拆成 1 和 5，走慢路径保持一致
+_SEPARATORS = str.maketrans(",;{}[]", "      ")
+
+
 def parse_float_array(text: str) -> np.ndarray:
     """从任意文本中提取浮点数字，返回 numpy float32 一维数组。"""
-    nums = re.findall(r"[-+]?\d*\.?\d+(?:[eE][-+]?\d+)?", text)
+    if _PLAIN_RE.fullmatch(text) and not _DOT_EXP_RE.search(text):
+        try:
+            return np.array(text.translate(_SEPARATORS).split(), dtype=np.float32)
+        except ValueError:
+            pass  # 例如 "1-2" 这种粘连的数字，交给正则拆分
+    nums = _FLOAT_RE.findall(text)
     if not nums:
         return np.array([], dtype=np.float32)
-    arr = np.array([float(n) for n in nums], dtype=np.float32)
-    return arr
+    # numpy 直接在 C 里把字符串转成浮点，省去逐个 float() 调用
+    return np.array(nums, dtype=np.float32)
 
 
 def float_array_to_wav(
@@ -21,10 +33,14 @@ def float_array_to_wav(
     bit_depth: int = 16,
 ):
     """将一维浮点数组保存为 PCM WAV 文件。"""
-    arr = np.asarray(list(samples), dtype=np.float32)
+    # 数组直接转换，只有生成器等纯迭代对象才逐个读取
+    if hasattr(samples, "__array__") or isinstance(samples, (list, tuple)):
+        arr = np.array(samples, dtype=np.float32)
+    else:
+        arr = np.fromiter(samples, dtype=np.float32)
     if arr.ndim != 1:
         raise ValueError("Only 1-D arrays are supported")
-    arr = np.clip(arr, -1.0, 1.0)
+    np.clip(arr, -1.0, 1.0, out=arr)
     subtype = {16: "PCM_16", 24: "PCM_24", 32: "PCM_32"}.get(bit_depth)
     if subtype is None:
         raise ValueError("Unsupported bit depth: choose 16, 24 or 32")
@@ -5,6 +5,10 @@ Launcher wrapper for `drumbin.app`.
 
 Keeps backward compatibility for `python app.py` by delegating to
 `drumbin.app.main()`.
+
+Startup import cost can be profiled with `python -X importtime drumbin.py`.
+mido and numba are only needed by the MIDI page and are imported on the
+first conversion, so they should not show up in that report.
 """
 
 from drumbin.app import main
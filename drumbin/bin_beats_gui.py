@@ -5,9 +5,11 @@ WAV -> BIN (Offsets) Page - Slot Based UI
 
 import sys
 import os
+import stat
 import json
 import soundfile as sf
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Optional, List, Any
 from .bin_generator import BinGenerator
 
@@ -16,7 +18,7 @@ from PySide6.QtWidgets import (
     QScrollArea, QFrame, QFileDialog, QMessageBox, QDialog,
     QProgressBar, QSizePolicy, QApplication
 )
-from PySide6.QtCore import Qt, Signal, QUrl, QTimer, QSize
+from PySide6.QtCore import Qt, Signal, QUrl, QTimer, QSize, QThread
 from PySide6.QtGui import QDragEnterEvent, QDropEvent, QIcon, QColor, QPalette, QAction
 from PySide6.QtMultimedia import QMediaPlayer, QAudioOutput
 
@@ -39,6 +41,40 @@ DEFAULT_MAP = {
     43: "通鼓3 (Tom 3)"
 }
 
+WAV_EXTENSIONS = (".wav", ".wave")
+# Worker threads used to probe the saved kit on startup; header reads overlap on slow disks
+PROBE_WORKERS = min(32, (os.cpu_count() or 4) * 4)
+
+def wav_file_size(path: str) -> Optional[int]:
+    """
+    Size in bytes if path looks like a WAV file, else None.
+
+    One open/fstat/read/close: the extension is checked first, then the
+    RIFF/WAVE tag in the first 12 bytes.
+    """
+    if not path.lower().endswith(WAV_EXTENSIONS):
+        return None
+    try:
+        fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    except OSError:
+        return None
+    try:
+        st = os.fstat(fd)
+        if not stat.S_ISREG(st.st_mode) or st.st_size < 12:
+            return None
+        hdr = os.pread(fd, 12, 0) if hasattr(os, "pread") else os.read(fd, 12)
+    except OSError:
+        return None
+    finally:
+        os.close(fd)
+    if hdr[:4] != b"RIFF" or hdr[8:12] != b"WAVE":
+        return None
+    return st.st_size
+
+def is_wav(path: str) -> bool:
+    """Cheap pre-check: .wav extension and a RIFF/WAVE tag in the first 12 bytes."""
+    return wav_file_size(path) is not None
+
 def get_drum_name(midi_id: int) -> str:
     return DEFAULT_MAP.get(midi_id, f"音符 {midi_id} (Note {midi_id})")
 
@@ -138,27 +174,36 @@ class DrumSlotWidget(QFrame):
         layout.addWidget(self.progress)
         layout.addWidget(self.btn_delete)
         
-        # Audio Player
-        self.player = QMediaPlayer()
-        self.audio_output = QAudioOutput()
-        self.player.setAudioOutput(self.audio_output)
-        
-        self.player.positionChanged.connect(self.on_position_changed)
-        self.player.mediaStatusChanged.connect(self.on_media_status_changed)
+        # Audio Player: created on first play, most slots are never auditioned
+        self.player: Optional[QMediaPlayer] = None
+        self.audio_output: Optional[QAudioOutput] = None
         
         # Timer for 100ms update (Qt6 QMediaPlayer emits positionChanged regularly)
         # If needed, we can use a QTimer to query position, but usually signal is enough.
         
-    def set_file(self, path: str, confirm_override=False):
+    def _ensure_player(self) -> QMediaPlayer:
+        if self.player is None:
+            self.player = QMediaPlayer(self)
+            self.audio_output = QAudioOutput(self)
+            self.player.setAudioOutput(self.audio_output)
+            self.player.positionChanged.connect(self.on_position_changed)
+            self.player.mediaStatusChanged.connect(self.on_media_status_changed)
+        return self.player
+
+    def is_playing(self) -> bool:
+        return self.player is not None and self.player.playbackState() == QMediaPlayer.PlayingState
+
+    def set_file(self, path: str, confirm_override=False, probed=None):
         if self.file_path and self.file_path != path and confirm_override:
             # Signal parent to handle confirmation logic if needed, 
             # or just handle it here. 
             # Parent handles the global logic, here we just update if told to.
             pass
             
-        # Validation
-        valid, msg = self.validate_wav(path)
-        if not valid:
+        # Validation (one header read, reused for the duration below);
+        # probed is a probe_wav() result the caller already has
+        info, msg = probed if probed is not None else self.probe_wav(path)
+        if info is None:
             show_toast(self.window(), f"文件无效: {msg}")
             self.set_style_invalid()
             QTimer.singleShot(1000, self.reset_style)
@@ -166,19 +211,14 @@ class DrumSlotWidget(QFrame):
 
         # Success
         self.file_path = path
-        try:
-            info = sf.info(path)
-            self.duration_sec = info.duration
-            self.lbl_file.setText(f"{os.path.basename(path)} ({self.duration_sec:.2f}s)")
-            self.lbl_file.setStyleSheet("color: black;")
-            self.btn_play.setEnabled(True)
-            self.btn_delete.setEnabled(True)
-            self.file_changed.emit(self.midi_id, path)
-            self.reset_style()
-            return True
-        except Exception as e:
-            show_toast(self.window(), f"读取错误: {e}")
-            return False
+        self.duration_sec = info.duration
+        self.lbl_file.setText(f"{os.path.basename(path)} ({self.duration_sec:.2f}s)")
+        self.lbl_file.setStyleSheet("color: black;")
+        self.btn_play.setEnabled(True)
+        self.btn_delete.setEnabled(True)
+        self.file_changed.emit(self.midi_id, path)
+        self.reset_style()
+        return True
 
     def clear_file(self):
         """Remove file from slot"""
@@ -190,7 +230,7 @@ class DrumSlotWidget(QFrame):
         self.btn_delete.setEnabled(False)
         
         # Stop playback if playing
-        if self.player.playbackState() == QMediaPlayer.PlayingState:
+        if self.is_playing():
             self.player.stop()
             self.btn_play.setText("▶")
             self.progress.setVisible(False)
@@ -199,33 +239,46 @@ class DrumSlotWidget(QFrame):
         self.file_changed.emit(self.midi_id, None)
 
     def validate_wav(self, path: str) -> (bool, str):
-        if not os.path.exists(path):
-            return False, "文件不存在"
+        info, msg = self.probe_wav(path)
+        return info is not None, msg
+
+    @staticmethod
+    def probe_wav(path: str):
+        """Open the header once; return (sf.info, "") or (None, reason)."""
+        if not is_wav(path):
+            if not os.path.exists(path):
+                return None, "文件不存在"
+            return None, "非 WAV 格式"
         try:
             info = sf.info(path)
-            if info.format != 'WAV':
-                return False, "非 WAV 格式"
-            # Strict sample rate check removed per user request
-            # if info.samplerate not in [44100, 48000]:
-            #    return False, f"不支持的采样率: {info.samplerate}Hz (仅支持 44.1/48kHz)"
-            # sf.info subtype can be 'PCM_16', 'PCM_24', 'FLOAT', etc.
-            if info.subtype not in ['PCM_16', 'PCM_24']:
-                 return False, f"不支持的位深: {info.subtype} (仅支持 16/24-bit)"
-            return True, ""
+        except FileNotFoundError:
+            return None, "文件不存在"
         except Exception as e:
-            return False, str(e)
+            if not os.path.exists(path):
+                return None, "文件不存在"
+            return None, str(e)
+        if info.format != 'WAV':
+            return None, "非 WAV 格式"
+        # Strict sample rate check removed per user request
+        # if info.samplerate not in [44100, 48000]:
+        #    return None, f"不支持的采样率: {info.samplerate}Hz (仅支持 44.1/48kHz)"
+        # sf.info subtype can be 'PCM_16', 'PCM_24', 'FLOAT', etc.
+        if info.subtype not in ['PCM_16', 'PCM_24']:
+            return None, f"不支持的位深: {info.subtype} (仅支持 16/24-bit)"
+        return info, ""
 
     def toggle_play(self):
-        if self.player.playbackState() == QMediaPlayer.PlayingState:
+        if self.is_playing():
             self.player.stop()
             self.btn_play.setText("▶")
             self.progress.setVisible(False)
         else:
             if not self.file_path:
                 return
-            self.player.setSource(QUrl.fromLocalFile(self.file_path))
+            player = self._ensure_player()
+            player.setSource(QUrl.fromLocalFile(self.file_path))
             self.audio_output.setVolume(1.0)
-            self.player.play()
+            player.play()
             self.btn_play.setText("⏹")
             self.progress.setVisible(True)
 
@@ -304,6 +357,37 @@ class DrumSlotWidget(QFrame):
         self.setStyleSheet("DrumSlotWidget { border: 2px solid red; background-color: #FFCDD2; }")
 
 
+# ---- Export Worker ----
+
+class ExportWorker(QThread):
+    """Writes the BIN and its layout files off the GUI thread."""
+    progress_signal = Signal(int)  # percent of WAV data written
+    error_signal = Signal(str)
+    finished_signal = Signal(dict)  # generator stats
+
+    def __init__(self, generator: BinGenerator, out_path: str, base_path: str):
+        super().__init__()
+        self.generator = generator
+        self.out_path = out_path
+        self.base_path = base_path
+        self._last_pct = -1
+
+    def run(self):
+        try:
+            stats = self.generator.generate(self.out_path, self.base_path, self._report)
+        except Exception as e:
+            self.error_signal.emit(str(e))
+            return
+        self.finished_signal.emit(stats)
+
+    def _report(self, done: int, total: int):
+        # byte counts overflow a Qt int for multi-GB kits; send a percentage
+        pct = done * 100 // total if total else 100
+        if pct != self._last_pct:
+            self._last_pct = pct
+            self.progress_signal.emit(pct)
+
+
 # ---- Main Page ----
 
 class BinBeatsPage(QWidget):
@@ -312,19 +396,26 @@ class BinBeatsPage(QWidget):
         
         # Data
         self.slots: Dict[int, DrumSlotWidget] = {}
+        self.worker: Optional[ExportWorker] = None
+        self._export_path = ""
         
         # Layout
         main_layout = QVBoxLayout(self)
         
         # Toolbar
         toolbar = QHBoxLayout()
-        btn_export = QPushButton("生成 BIN (Offsets)")
+        self.btn_export = btn_export = QPushButton("生成 BIN (Offsets)")
         btn_export.clicked.connect(self.export_bin)
-        btn_reload = QPushButton("重置/清空")
+        self.btn_reload = btn_reload = QPushButton("重置/清空")
         btn_reload.clicked.connect(self.reset_all)
+        self.export_bar = QProgressBar()
+        self.export_bar.setRange(0, 100)
+        self.export_bar.setFixedWidth(160)
+        self.export_bar.setVisible(False)
         
         toolbar.addWidget(btn_reload)
         toolbar.addStretch()
+        toolbar.addWidget(self.export_bar)
         toolbar.addWidget(btn_export)
         
         main_layout.addLayout(toolbar)
@@ -359,10 +450,17 @@ class BinBeatsPage(QWidget):
             if os.path.exists(CONFIG_FILE):
                 with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
                     data = json.load(f)
-                    for midi_str, path in data.items():
-                        midi_id = int(midi_str)
-                        if midi_id in self.slots and os.path.exists(path):
-                            self.slots[midi_id].set_file(path)
+                entries = [(self.slots[int(midi_str)], path) for midi_str, path in data.items()
+                           if int(midi_str) in self.slots]
+                if not entries:
+                    return
+                # Probe every saved WAV at once; the slots are then filled on this thread
+                with ThreadPoolExecutor(max_workers=min(len(entries), PROBE_WORKERS)) as pool:
+                    probes = list(pool.map(DrumSlotWidget.probe_wav, [path for _, path in entries]))
+                for (slot, path), probe in zip(entries, probes):
+                    if probe[0] is None and not os.path.exists(path):
+                        continue  # files that have gone away are dropped silently, as before
+                    slot.set_file(path, probed=probe)
         except Exception as e:
             print(f"Config load error: {e}")
 
@@ -415,37 +513,56 @@ class BinBeatsPage(QWidget):
         if not out_path:
             return
             
-        # 3. Generate
-        try:
-            generator = BinGenerator()
-            # Iterate active_midi_ids to maintain order
-            for i in self.active_midi_ids:
-                slot = self.slots.get(i)
-                if slot and slot.file_path and os.path.exists(slot.file_path):
-                    generator.add_file(i, slot.file_path)
-            
-            base_path = os.path.splitext(out_path)[0]
-            stats = generator.generate(out_path, base_path)
-            
-            # 4. Show Result
-            msg_text = (
-                f"导出成功！\n\n"
-                f"总大小: {stats['total_size']} 字节 ({stats['total_size']/1024:.2f} KB)\n"
-                f"样本数: {stats['wav_count']} 个\n\n"
-                f"偏移表已保存至:\n"
-                f"{os.path.basename(base_path)}_layout.h"
-            )
-            
-            msg = QMessageBox(self)
-            msg.setWindowTitle("导出完成")
-            msg.setText(msg_text)
-            btn_open = msg.addButton("打开目录", QMessageBox.ActionRole)
-            msg.addButton(QMessageBox.Ok)
-            msg.exec()
-            
-            if msg.clickedButton() == btn_open:
-                os.startfile(os.path.dirname(out_path))
-                
-        except Exception as e:
-            QMessageBox.critical(self, "导出错误", f"导出过程中发生错误:\n{e}")
+        # 3. Generate (on a worker thread so large kits don't freeze the window)
+        generator = BinGenerator()
+        # Iterate active_midi_ids to maintain order
+        for i in self.active_midi_ids:
+            slot = self.slots.get(i)
+            if slot and slot.file_path and os.path.exists(slot.file_path):
+                generator.add_file(i, slot.file_path)
+
+        self._export_path = out_path
+        self._set_busy(True)
+        self.worker = ExportWorker(generator, out_path, os.path.splitext(out_path)[0])
+        self.worker.progress_signal.connect(self.export_progress)
+        self.worker.error_signal.connect(self.export_failed)
+        self.worker.finished_signal.connect(self.export_finished)
+        self.worker.start()
+
+    def export_progress(self, pct: int):
+        self.export_bar.setValue(pct)
+
+    def export_failed(self, message: str):
+        self._set_busy(False)
+        QMessageBox.critical(self, "导出错误", f"导出过程中发生错误:\n{message}")
 
+    def _set_busy(self, busy: bool):
+        """Lock the toolbar while a BIN is being written."""
+        self.btn_export.setEnabled(not busy)
+        self.btn_reload.setEnabled(not busy)
+        self.export_bar.setValue(0)
+        self.export_bar.setVisible(busy)
+
+    def export_finished(self, stats: dict):
+        self._set_busy(False)
+        out_path = self._export_path
+        base_path = os.path.splitext(out_path)[0]
+
+        # 4. Show Result
+        msg_text = (
+            f"导出成功！\n\n"
+            f"总大小: {stats['total_size']} 字节 ({stats['total_size']/1024:.2f} KB)\n"
+            f"样本数: {stats['wav_count']} 个\n\n"
+            f"偏移表已保存至:\n"
+            f"{os.path.basename(base_path)}_layout.h"
+        )
+        
+        msg = QMessageBox(self)
+        msg.setWindowTitle("导出完成")
+        msg.setText(msg_text)
+        btn_open = msg.addButton("打开目录", QMessageBox.ActionRole)
+        msg.addButton(QMessageBox.Ok)
+        msg.exec()
+        
+        if msg.clickedButton() == btn_open:
+            os.startfile(os.path.dirname(out_path))
@@ -169,6 +169,7 @@ class CleanerWidget(QWidget):
     def __init__(self):
         super().__init__()
         self.files = []  # List[Tuple[full_path, root_path]]
+        self._paths = set()  # realpaths already in self.files
         self.worker = None
 
         self.init_ui()
@@ -270,40 +271,61 @@ class CleanerWidget(QWidget):
         self.add_paths(paths)
 
     def add_paths(self, paths):
+        start = len(self.files)
         for p in paths:
             if os.path.isdir(p):
                 self.scan_directory(p, p)
             else:
                 if self.is_supported(p):
                     self.add_file_item(p, os.path.dirname(p))
+        self.show_new_items(start)
 
     def add_folder(self):
         d = QFileDialog.getExistingDirectory(self, "Select Folder")
         if d:
+            start = len(self.files)
             self.scan_directory(d, d)
+            self.show_new_items(start)
 
     def scan_directory(self, root_path, base_path):
-        for root, dirs, files in os.walk(root_path):
-            for f in files:
-                full_path = os.path.join(root, f)
-                if self.is_supported(full_path):
-                    self.add_file_item(full_path, base_path)
+        # scandir hands back the entry type with the listing, so there is no stat per file;
+        # files come before subfolders, in the same order os.walk used
+        try:
+            with os.scandir(root_path) as it:
+                entries = list(it)
+        except OSError:
+            return
+        subdirs = []
+        for e in entries:
+            if e.is_dir():
+                if not e.is_symlink():
+                    subdirs.append(e.path)
+            elif self.is_supported(e.name):
+                self.add_file_item(e.path, base_path)
+        for d in subdirs:
+            self.scan_directory(d, base_path)
 
     def is_supported(self, path):
         ext = os.path.splitext(path)[1].lower().lstrip('.')
         return ext in DEFAULT_EXTS
 
     def add_file_item(self, path, root):
-        # Avoid duplicates
-        # O(N) check is fine for small lists, but for thousands might be slow. 
-        # For now assume user doesn't drag 10k files at once.
-        if any(f[0] == path for f in self.files):
+        # Avoid duplicates, including the same file reached through a symlink
+        rp = os.path.realpath(path)
+        if rp in self._paths:
             return
+        self._paths.add(rp)
         self.files.append((path, root))
-        self.list_widget.addItem(f"{os.path.basename(path)}  ({os.path.dirname(path)})")
+
+    def show_new_items(self, start):
+        # One addItems() per drop/folder instead of a list update (and relayout) per file
+        self.list_widget.addItems([
+            f"{os.path.basename(path)}  ({os.path.dirname(path)})" for path, _ in self.files[start:]
+        ])
 
     def clear_list(self):
         self.files.clear()
+        self._paths.clear()
         self.list_widget.clear()
 
     def browse_output(self):
@@ -3,46 +3,94 @@
 MIDI PPQN Converter Page
 """
 
+import functools
 import os
 import re
-import mido
-from typing import List, Tuple, Optional
+import shutil
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, List, Set, Tuple, Optional
+
+if TYPE_CHECKING:  # mido itself is imported on the first conversion
+    import mido
 
 from PySide6.QtWidgets import (
-    QApplication, QWidget, QVBoxLayout, QPushButton, QTableWidget, QTableWidgetItem,
+    QWidget, QVBoxLayout, QPushButton, QTableView,
     QFileDialog, QMessageBox, QLabel, QHBoxLayout, QAbstractItemView, QSpinBox, QCheckBox,
     QLineEdit
 )
-from PySide6.QtCore import Qt, QUrl
+from PySide6.QtCore import Qt, QUrl, QTimer, QAbstractTableModel, QModelIndex, QThread, Signal
 from PySide6.QtGui import QDesktopServices
 
 
+# Worker threads used to probe dropped files; reads overlap while each waits on disk
+PROBE_WORKERS = min(32, (os.cpu_count() or 4) * 4)
+
+
 def is_midi_file(path: str) -> bool:
     ext = os.path.splitext(path)[1].lower()
     return ext in {".mid", ".midi"}
 
+def iter_midi_files(root: str):
+    """Yield MIDI file paths below root, reusing each DirEntry instead of a stat per file."""
+    try:
+        with os.scandir(root) as it:
+            for e in it:
+                if e.is_dir(follow_symlinks=False):
+                    yield from iter_midi_files(e.path)
+                elif is_midi_file(e.name) and e.is_file():
+                    yield e.path
+    except OSError:
+        return
+
 def probe_midi(path: str) -> Tuple[Optional[int], Optional[int], Optional[str]]:
-    """Return (ppqn, tracks_count, error)"""
+    """
+    Return (ppqn, tracks_count, error) from the 14-byte MThd header alone.
+    The events are only parsed (by mido) when the file is converted.
+    """
     try:
-        mid = mido.MidiFile(path)
-        return mid.ticks_per_beat, len(mid.tracks), None
-    except Exception as e:
+        with open(path, "rb") as f:
+            hdr = f.read(14)
+    except OSError as e:
         return None, None, str(e)
-
-def suggest_output_path(src: str, ppqn: int, out_dir: Optional[str], overwrite: bool) -> str:
-    base = os.path.splitext(os.path.basename(src))[0]
+    if len(hdr) < 14 or hdr[:4] != b"MThd" or int.from_bytes(hdr[4:8], "big") < 6:
+        return None, None, "MThd not found. Probably not a MIDI file"
+    tracks = int.from_bytes(hdr[10:12], "big")
+    ppqn = int.from_bytes(hdr[12:14], "big")
+    if ppqn & 0x8000:
+        return None, None, "SMPTE time division is not supported"
+    return ppqn, tracks, None
+
+@functools.lru_cache(maxsize=4096)
+def path_stem(path: str) -> str:
+    """File name without directory or extension; cached since every refresh asks again per row."""
+    return os.path.splitext(os.path.basename(path))[0]
+
+def suggest_output_path(src: str, ppqn: int, out_dir: Optional[str], overwrite: bool,
+                        taken: Optional[set] = None) -> str:
+    """Output path for src; paths in `taken` (claimed earlier in the same batch) are never reused."""
+    base = path_stem(src)
     folder = out_dir if out_dir else os.path.dirname(src)
     name = f"{base}_ppqn{ppqn}.mid"
     out = os.path.join(folder, name)
-    if overwrite:
+    taken = taken or ()
+    if out not in taken and (overwrite or not os.path.exists(out)):
         return out
-    # Avoid overwriting by adding (n) suffix
-    candidate = out
+    # Avoid overwriting by adding (n) suffix; list the folder once instead of a stat per candidate
+    existing = set()
+    if not overwrite:
+        try:
+            with os.scandir(folder) as it:
+                existing = {os.path.normcase(e.name) for e in it}
+        except OSError:
+            pass
     i = 1
-    while os.path.exists(candidate):
-        candidate = os.path.join(folder, f"{base}_ppqn{ppqn} ({i}).mid")
+    while True:
+        name = f"{base}_ppqn{ppqn} ({i}).mid"
+        candidate = os.path.join(folder, name)
+        if candidate not in taken and os.path.normcase(name) not in existing:
+            return candidate
         i += 1
-    return candidate
 
 def to_c_identifier(s: str) -> str:
     s2 = re.sub(r'[^0-9a-zA-Z_]', '_', s)
@@ -50,6 +98,26 @@ def to_c_identifier(s: str) -> str:
         s2 = '_' + s2
     return s2
 
+# "0x00, " .. "0xFF, " as ASCII rows of a (256, 6) table, indexed by byte value
+_HEX_TOKENS = np.frombuffer(b"".join(b"0x%02X, " % b for b in range(256)), dtype=np.uint8).reshape(256, 6)
+
+def _hex_body(data: bytes, nl: bytes = b"\n") -> bytes:
+    """Array initializer body as ASCII: 16 bytes per line, indented, comma-separated."""
+    arr = np.frombuffer(data, dtype=np.uint8)
+    n_full = arr.size - arr.size % 16
+    # Whole lines are assembled as one uint8 block: indent, 16 tokens, "," + newline
+    line = 16 * 6 - 1  # "0xNN, " * 16 without the last space
+    rows = np.empty((n_full // 16, 4 + line + len(nl)), dtype=np.uint8)
+    rows[:, :4] = ord(" ")
+    rows[:, 4:4 + line] = _HEX_TOKENS[arr[:n_full]].reshape(-1, 16 * 6)[:, :line]
+    rows[:, 4 + line:] = np.frombuffer(nl, dtype=np.uint8)
+    out = rows.tobytes()
+    if n_full < arr.size:
+        out += b"    " + _HEX_TOKENS[arr[n_full:]].tobytes()[:-2]
+    else:
+        out = out[:-1 - len(nl)]
+    return out
+
 def export_hex_header_from_file(src: str, header_path: str, varname: str):
     """
     Write a C header containing an unsigned char array of the exact MIDI bytes in hex.
@@ -59,63 +127,158 @@ def export_hex_header_from_file(src: str, header_path: str, varname: str):
     with open(src, "rb") as f:
         data = f.read()
 
-    # Format: 16 bytes per line, uppercase hex
-    lines = []
-    for i in range(0, len(data), 16):
-        chunk = ", ".join(f"0x{b:02X}" for b in data[i:i+16])
-        lines.append("    " + chunk)
-    body = ",\n".join(lines) if lines else "    /* empty */"
+    # The header is assembled as bytes and written once in binary mode; newlines are
+    # os.linesep, which is what the text-mode writer produced before
+    nl = os.linesep.encode("ascii")
+
+    # Format: 16 bytes per line, uppercase hex, looked up from a precomputed table
+    body = _hex_body(data, nl) if data else b"    /* empty */"
 
     guard = to_c_identifier(os.path.basename(header_path)).upper() + "_INCLUDE_GUARD"
     base = to_c_identifier(varname)
-    content = (
+    head = (
         f"#ifndef {guard}\n#define {guard}\n\n"
         f"#include <stddef.h>\n\n"
         f"/* Autogenerated: raw MIDI bytes as hex.\n"
         f" * Byte count = {len(data)}.\n"
         f" */\n"
-        f"static const unsigned char {base}[{len(data)}] = {{\n{body}\n}};\n\n"
+        f"static const unsigned char {base}[{len(data)}] = {{\n"
+    )
+    tail = (
+        f"\n}};\n\n"
         f"static const size_t {base}_size = {len(data)};\n\n"
         f"#endif /* {guard} */\n"
     )
-    with open(header_path, "w", encoding="utf-8") as w:
-        w.write(content)
+    with open(header_path, "wb") as w:
+        w.write(b"".join((
+            head.replace("\n", os.linesep).encode("utf-8"),
+            body,
+            tail.replace("\n", os.linesep).encode("utf-8"),
+        )))
+
+def _rescale_deltas(times: np.ndarray, scale: float) -> np.ndarray:
+    # Same arithmetic as round(abs_old * scale) on the running tick count
+    # (float64, ties to even), so converted files stay bit-identical.
+    new_abs = np.rint(np.cumsum(times) * scale).astype(np.int64)
+    return np.diff(new_abs, prepend=0)
+
+def _rescale_deltas_loop(times, scale):
+    # Loop form of _rescale_deltas for numba to compile; same rounding
+    out = np.empty_like(times)
+    abs_old = 0
+    prev = 0
+    for i in range(times.size):
+        abs_old += times[i]
+        cur = np.int64(np.rint(abs_old * scale))
+        out[i] = cur - prev
+        prev = cur
+    return out
+
+@functools.lru_cache(maxsize=None)
+def _rescale_kernel():
+    """
+    The delta rescaler used for conversion: _rescale_deltas_loop compiled by numba,
+    or the NumPy _rescale_deltas when numba is missing. numba takes ~0.2 s to
+    import, so it is only loaded on the first conversion, not at app startup.
+    """
+    try:
+        from numba import njit
+    except ImportError:  # numba is optional
+        return _rescale_deltas
+    return njit(cache=True)(_rescale_deltas_loop)
+
+# Output buffer for saved MIDI files: big enough that a whole file is one write()
+SAVE_BUFFER = 1 << 20
+
+def save_midi(mid: "mido.MidiFile", dst: str):
+    """Save through one large buffer so the per-track chunk writes coalesce."""
+    with open(dst, "wb", buffering=SAVE_BUFFER) as f:
+        mid.save(file=f)
 
 def convert_midi_ppqn(src: str, dst: str, new_ppqn: int) -> str:
     """
     Convert MIDI PPQN preserving musical timing by rescaling delta-times.
     Returns a status string: 'converted', 'copied', or raises on error.
     """
+    # Same PPQN: the header says so, and the bytes are copied without parsing any events
+    old_ppqn, _, err = probe_midi(src)
+    if err is None and old_ppqn == new_ppqn:
+        try:
+            shutil.copyfile(src, dst)
+        except shutil.SameFileError:
+            pass  # overwriting a file with itself
+        return "copied"
+
+    # mido is only needed once something is converted; keep it off the startup path
+    import mido
+
     mid = mido.MidiFile(src)
     old_ppqn = mid.ticks_per_beat
-    if old_ppqn == new_ppqn:
-        mid.save(dst)
-        return "copied"
 
     scale = float(new_ppqn) / float(old_ppqn)
+    rescale = _rescale_kernel()
 
-    new_mid = mido.MidiFile()
-    new_mid.ticks_per_beat = new_ppqn
-
+    # The parsed file is thrown away after saving, so retime its messages in
+    # place instead of copying every one into a new MidiFile.
     for track in mid.tracks:
-        new_track = mido.MidiTrack()
-        new_mid.tracks.append(new_track)
-
-        abs_old = 0
-        abs_new_rounded = 0
-
-        for msg in track:
-            abs_old += msg.time
-            new_abs = abs_old * scale
-            new_abs_rounded = int(round(new_abs))
-            delta = new_abs_rounded - abs_new_rounded
-            new_track.append(msg.copy(time=delta))
-            abs_new_rounded = new_abs_rounded
-
-    new_mid.save(dst)
+        times = np.fromiter((msg.time for msg in track), dtype=np.int64, count=len(track))
+        deltas = rescale(times, scale).tolist()
+        for msg, delta in zip(track, deltas):
+            # bypass Message.__setattr__ validation; delta is already a plain int
+            msg.__dict__['time'] = delta
+
+    mid.type = 1  # converted files have always been written as type 1
+    mid.ticks_per_beat = new_ppqn
+    save_midi(mid, dst)
     return "converted"
 
-class MidiTable(QTableWidget):
+def convert_one(src: str, dst: str, new_ppqn: int, export_hex: bool) -> Tuple[str, str, str]:
+    """
+    Convert one file and optionally write its hex header next to it.
+    Returns (result, header_cell, status_suffix); conversion errors propagate.
+    """
+    result = convert_midi_ppqn(src, dst, new_ppqn)
+    if not export_hex:
+        return result, "", ""
+    try:
+        folder = os.path.dirname(dst)
+        base = os.path.splitext(os.path.basename(dst))[0]
+        varname = to_c_identifier(base + "_hex")
+        header_path = os.path.join(folder, f"{base}_hex.h")
+        export_hex_header_from_file(dst, header_path, varname)
+        return result, header_path, " +hex.h"
+    except Exception as he:
+        return result, f"ERROR: {he}", f" (+hex FAILED: {he})"
+
+class ConvertWorker(QThread):
+    """Runs convert_one for a batch on a thread pool; the GUI thread only handles the signals."""
+    row_signal = Signal(int, str, str, str)  # row, result ("error" on failure), header cell, status suffix / error
+    finished_signal = Signal()
+
+    def __init__(self, jobs: List[Tuple[int, str, str]], new_ppqn: int, export_hex: bool):
+        super().__init__()
+        self.jobs = jobs  # (row, src, dst)
+        self.new_ppqn = new_ppqn
+        self.export_hex = export_hex
+
+    def run(self):
+        with ThreadPoolExecutor(max_workers=min(len(self.jobs), os.cpu_count() or 1)) as pool:
+            futures = {
+                pool.submit(convert_one, src, dst, self.new_ppqn, self.export_hex): row
+                for row, src, dst in self.jobs
+            }
+            for fut in as_completed(futures):
+                row = futures[fut]
+                try:
+                    result, header, header_ok = fut.result()
+                except Exception as e:
+                    self.row_signal.emit(row, "error", "", str(e))
+                    continue
+                self.row_signal.emit(row, result or "", header, header_ok)
+        self.finished_signal.emit()
+
+class MidiTableModel(QAbstractTableModel):
+    """Read-only view of MidiTable.items; cell text is produced only for rows Qt asks about."""
     COL_INDEX = 0
     COL_NAME = 1
     COL_PPQN = 2
@@ -124,21 +287,91 @@ class MidiTable(QTableWidget):
     COL_OUTPUT = 5
     COL_HEADER = 6
     COL_STATUS = 7
+    HEADERS = ["Index", "Filename", "PPQN", "Tracks", "Target PPQN", "Output (.mid)", "Header (.h)", "Status"]
+
+    def __init__(self, items: List[dict], parent=None):
+        super().__init__(parent)
+        self.items = items
+        self.target_ppqn: int = 120
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.items)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        row, col = index.row(), index.column()
+        item = self.items[row]
+        if col == self.COL_INDEX:
+            return str(row)
+        if col == self.COL_NAME:
+            return item["name"]
+        if col == self.COL_PPQN:
+            return str(item["ppqn"])
+        if col == self.COL_TRACKS:
+            return str(item["tracks"])
+        if col == self.COL_TARGET:
+            return str(self.target_ppqn)
+        if col == self.COL_OUTPUT:
+            return item.get("output", "")
+        if col == self.COL_HEADER:
+            return item.get("header", "")
+        if col == self.COL_STATUS:
+            return item.get("status", "")
+        return None
+
+    def reset(self):
+        self.beginResetModel()
+        self.endResetModel()
+
+    def rows_changed(self, first: int, last: int):
+        if first <= last:
+            self.dataChanged.emit(self.index(first, 0), self.index(last, len(self.HEADERS) - 1))
+
+    def columns_changed(self, first: int, last: int):
+        if self.items:
+            self.dataChanged.emit(self.index(0, first), self.index(len(self.items) - 1, last))
+
+class MidiTable(QTableView):
+    converting_changed = Signal(bool)  # a batch started (True) / finished (False)
+
+    COL_INDEX = MidiTableModel.COL_INDEX
+    COL_NAME = MidiTableModel.COL_NAME
+    COL_PPQN = MidiTableModel.COL_PPQN
+    COL_TRACKS = MidiTableModel.COL_TRACKS
+    COL_TARGET = MidiTableModel.COL_TARGET
+    COL_OUTPUT = MidiTableModel.COL_OUTPUT
+    COL_HEADER = MidiTableModel.COL_HEADER
+    COL_STATUS = MidiTableModel.COL_STATUS
 
     def __init__(self, parent=None):
-        super().__init__(0, 8, parent)
-        self.setHorizontalHeaderLabels(
-            ["Index", "Filename", "PPQN", "Tracks", "Target PPQN", "Output (.mid)", "Header (.h)", "Status"]
-        )
+        super().__init__(parent)
+        self.items: List[dict] = []
+        self._paths: Set[str] = set()  # realpaths of self.items, for duplicate checks
+        self.table_model = MidiTableModel(self.items, self)
+        self.setModel(self.table_model)
         self.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.setAcceptDrops(True)
 
-        self.items: List[dict] = []
         self.target_ppqn: int = 120
         self.out_dir: Optional[str] = None
         self.overwrite: bool = False
         self.export_hex: bool = False  # NEW: export .h with unsigned char hex array
+        self._resize_pending = False
+        self._output_settings = None
+        self.worker: Optional[ConvertWorker] = None
+        self._converting = False
+        self._counts = {}
+        self._headers = {}
 
         self.resizeColumnsToContents()
 
@@ -155,41 +388,66 @@ class MidiTable(QTableWidget):
         for url in event.mimeData().urls():
             p = url.toLocalFile()
             if os.path.isdir(p):
-                for root, _, files in os.walk(p):
-                    for fn in files:
-                        paths.append(os.path.join(root, fn))
-            else:
+                # DirEntry already told us these are regular files
+                paths.extend(iter_midi_files(p))
+            elif is_midi_file(p) and os.path.isfile(p):
                 paths.append(p)
-        self.add_files(paths)
+        self.add_files(paths, checked=True)
 
     # Settings sync
+    # While a batch runs, rows keep the outputs convert_all reserved for them;
+    # the page also disables these controls until the batch has finished
     def set_target_ppqn(self, v: int):
+        if self.is_converting():
+            return
         self.target_ppqn = int(v)
-        self.refresh_table()
+        self.table_model.target_ppqn = self.target_ppqn
+        self._update_target_columns()
 
     def set_out_dir(self, path: Optional[str]):
+        if self.is_converting():
+            return
         self.out_dir = path if path else None
-        self.refresh_table()
+        self._update_target_columns()
 
     def set_overwrite(self, on: bool):
+        if self.is_converting():
+            return
         self.overwrite = bool(on)
-        self.refresh_table()
+        self._update_target_columns()
 
     def set_export_hex(self, on: bool):
         self.export_hex = bool(on)
 
     # Data ops
-    def add_files(self, paths: List[str]):
+    def add_files(self, paths: List[str], checked: bool = False):
+        """Probe and append MIDI files; checked=True means paths are known existing .mid/.midi files."""
         added = 0
-        for p in paths:
-            if not os.path.isfile(p) or not is_midi_file(p):
+        # Duplicates (overlapping folders in one drop, symlinks, or files already listed)
+        # are probed once at most; the extension test runs before any syscall
+        fresh = []
+        for p in dict.fromkeys(paths):
+            if not checked and not (is_midi_file(p) and os.path.isfile(p)):
                 continue
-            ppqn, tracks, err = probe_midi(p)
+            rp = os.path.realpath(p)
+            if rp in self._paths:
+                continue
+            self._paths.add(rp)
+            fresh.append((p, rp))
+        paths = [p for p, _ in fresh]
+        if len(paths) > 1:
+            with ThreadPoolExecutor(max_workers=min(len(paths), PROBE_WORKERS)) as pool:
+                results = list(pool.map(probe_midi, paths))
+        else:
+            results = [probe_midi(p) for p in paths]
+        for (p, rp), (ppqn, tracks, err) in zip(fresh, results):
             if err is not None or ppqn is None:
+                self._paths.discard(rp)
                 QMessageBox.warning(self, "Skip", f"Failed to read '{p}':\n{err}")
                 continue
             self.items.append({
                 "path": p,
+                "name": os.path.basename(p),
                 "ppqn": ppqn,
                 "tracks": tracks,
                 "status": "",
@@ -200,57 +458,87 @@ class MidiTable(QTableWidget):
             QMessageBox.information(self, "Info", "No valid MIDI files found.")
         self.refresh_table()
 
+    def is_converting(self) -> bool:
+        # set by convert_all, cleared when the finish slot runs (the thread may still be winding down)
+        return self._converting
+
     def clear_files(self):
+        if self.is_converting():
+            return  # rows are addressed by index until the batch finishes
         self.items.clear()
-        self.setRowCount(0)
+        self._paths.clear()
+        self.table_model.reset()
+
+    def selected_rows(self) -> List[int]:
+        return sorted(idx.row() for idx in self.selectionModel().selectedRows())
+
+    def update_row(self, i: int):
+        self.table_model.rows_changed(i, i)
 
     def move_up(self):
-        rows = sorted({idx.row() for idx in self.selectedIndexes()})
+        if self.is_converting():
+            return
+        rows = self.selected_rows()
         if not rows or rows[0] == 0:
             return
         for r in rows:
             self.items[r-1], self.items[r] = self.items[r], self.items[r-1]
         self.selectRow(rows[0]-1)
-        self.refresh_table()
+        self._refresh_rows(rows[0] - 1, rows[-1])
 
     def move_down(self):
-        rows = sorted({idx.row() for idx in self.selectedIndexes()}, reverse=True)
+        if self.is_converting():
+            return
+        rows = self.selected_rows()[::-1]
         if not rows or rows[0] == len(self.items) - 1:
             return
         for r in rows:
             self.items[r+1], self.items[r] = self.items[r], self.items[r+1]
         self.selectRow(rows[0]+1)
-        self.refresh_table()
+        self._refresh_rows(rows[-1], rows[0] + 1)
 
     def refresh_table(self):
-        self.setRowCount(len(self.items))
-        for i, item in enumerate(self.items):
-            p = item["path"]
-            name = os.path.basename(p)
-            out_path = suggest_output_path(p, self.target_ppqn, self.out_dir, self.overwrite)
-
-            self.setItem(i, self.COL_INDEX, QTableWidgetItem(str(i)))
-            self.setItem(i, self.COL_NAME, QTableWidgetItem(name))
-            self.setItem(i, self.COL_PPQN, QTableWidgetItem(str(item["ppqn"])))
-            self.setItem(i, self.COL_TRACKS, QTableWidgetItem(str(item["tracks"])))
-            self.setItem(i, self.COL_TARGET, QTableWidgetItem(str(self.target_ppqn)))
-            self.setItem(i, self.COL_OUTPUT, QTableWidgetItem(out_path))
-            self.setItem(i, self.COL_HEADER, QTableWidgetItem(item.get("header", "")))
-            self.setItem(i, self.COL_STATUS, QTableWidgetItem(item.get("status", "")))
-
+        # Output names only change with the settings; otherwise just fill in new rows
+        settings = (self.target_ppqn, self.out_dir, self.overwrite)
+        stale = settings != self._output_settings
+        self._output_settings = settings
+        for item in self.items:
+            if stale or "output" not in item:
+                item["output"] = suggest_output_path(item["path"], self.target_ppqn, self.out_dir, self.overwrite)
+        # The view pulls only the rows it shows; no per-cell items are built
+        self.table_model.reset()
+        self.schedule_resize()
+
+    def _update_target_columns(self):
+        """Settings changed: recompute outputs and repaint only Target/Output; rows and selection stay."""
+        self._output_settings = (self.target_ppqn, self.out_dir, self.overwrite)
+        for item in self.items:
+            item["output"] = suggest_output_path(item["path"], self.target_ppqn, self.out_dir, self.overwrite)
+        self.table_model.columns_changed(self.COL_TARGET, self.COL_OUTPUT)
+        self.schedule_resize()
+
+    def schedule_resize(self):
+        """Resize columns once the event loop is idle; back-to-back refreshes share one pass."""
+        if not self._resize_pending:
+            self._resize_pending = True
+            QTimer.singleShot(0, self._resize_now)
+
+    def _resize_now(self):
+        self._resize_pending = False
         self.resizeColumnsToContents()
 
+    def _refresh_rows(self, first: int, last: int):
+        """Repaint only rows first..last (inclusive), e.g. the ones a move touched."""
+        self.table_model.rows_changed(first, last)
+
     # Export
     def convert_all(self):
+        if self.is_converting():
+            return
         if not self.items:
             QMessageBox.warning(self, "Warning", "No files to convert.")
             return
 
-        successes = 0
-        copies = 0
-        errors = 0
-        header_paths = []
-
         if self.out_dir and not os.path.isdir(self.out_dir):
             try:
                 os.makedirs(self.out_dir, exist_ok=True)
@@ -258,46 +546,52 @@ class MidiTable(QTableWidget):
                 QMessageBox.critical(self, "Error", f"Cannot create output directory:\n{self.out_dir}\n{e}")
                 return
 
+        # Reserve every output name up front so parallel jobs never share a destination
+        jobs = []
+        taken = set()
         for i, item in enumerate(self.items):
-            src = item["path"]
-            dst = suggest_output_path(src, self.target_ppqn, self.out_dir, self.overwrite)
-
-            self.item(i, self.COL_STATUS).setText("Converting...")
-            QApplication.processEvents()
-
-            try:
-                result = convert_midi_ppqn(src, dst, self.target_ppqn)
-                header_ok = ""
-                header_path = ""
-                if self.export_hex:
-                    try:
-                        folder = os.path.dirname(dst)
-                        base = os.path.splitext(os.path.basename(dst))[0]
-                        varname = to_c_identifier(base + "_hex")
-                        header_path = os.path.join(folder, f"{base}_hex.h")
-                        export_hex_header_from_file(dst, header_path, varname)
-                        item["header"] = header_path
-                        header_paths.append(header_path)
-                        header_ok = " +hex.h"
-                    except Exception as he:
-                        item["header"] = f"ERROR: {he}"
-                        header_ok = f" (+hex FAILED: {he})"
-                if result == "converted":
-                    item["status"] = "OK" + header_ok
-                    successes += 1
-                elif result == "copied":
-                    item["status"] = "Skipped (same PPQN → copied)" + header_ok
-                    copies += 1
-                else:
-                    item["status"] = (result or "OK") + header_ok
-                    successes += 1
-            except Exception as e:
-                item["status"] = f"Error: {e}"
-                errors += 1
+            dst = suggest_output_path(item["path"], self.target_ppqn, self.out_dir, self.overwrite, taken)
+            taken.add(dst)
+            item["output"] = dst
+            item["status"] = "Converting..."
+            jobs.append((i, item["path"], dst))
+        self.table_model.rows_changed(0, len(self.items) - 1)
+
+        self._counts = {"converted": 0, "copied": 0, "error": 0}
+        self._headers = {}
+        self.worker = ConvertWorker(jobs, self.target_ppqn, self.export_hex)
+        self.worker.row_signal.connect(self._row_converted)
+        self.worker.finished_signal.connect(self._convert_finished)
+        self._converting = True
+        self.converting_changed.emit(True)
+        self.worker.start()
+
+    def _row_converted(self, i: int, result: str, header: str, header_ok: str):
+        item = self.items[i]
+        if result == "error":
+            item["status"] = f"Error: {header_ok}"
+            self._counts["error"] += 1
+        else:
+            if header:
+                item["header"] = header
+                if not header.startswith("ERROR: "):
+                    self._headers[i] = header
+            if result == "converted":
+                item["status"] = "OK" + header_ok
+                self._counts["converted"] += 1
+            elif result == "copied":
+                item["status"] = "Skipped (same PPQN → copied)" + header_ok
+                self._counts["copied"] += 1
+            else:
+                item["status"] = (result or "OK") + header_ok
+                self._counts["converted"] += 1
+        self.update_row(i)
 
-            self.setItem(i, self.COL_OUTPUT, QTableWidgetItem(dst))
-            self.setItem(i, self.COL_HEADER, QTableWidgetItem(item.get("header", "")))
-            self.setItem(i, self.COL_STATUS, QTableWidgetItem(item["status"]))
+    def _convert_finished(self):
+        self._converting = False
+        self.converting_changed.emit(False)
+        header_paths = [self._headers[i] for i in sorted(self._headers)]
+        successes, copies, errors = self._counts["converted"], self._counts["copied"], self._counts["error"]
 
         self.resizeColumnsToContents()
 
@@ -307,6 +601,9 @@ class MidiTable(QTableWidget):
         else:
             QMessageBox.information(self, "Success", msg)
 
+# Quiet time after the last PPQN spin edit before the table is updated
+PPQN_DEBOUNCE_MS = 100
+
 class MidiPPQNPage(QWidget):
     def __init__(self):
         super().__init__()
@@ -326,12 +623,17 @@ class MidiPPQNPage(QWidget):
         self.ppqn_spin.setValue(120)
         self.ppqn_spin.setSingleStep(1)
         self.ppqn_spin.setToolTip("Target PPQN (ticks per quarter note)")
+        # valueChanged fires per keypress/arrow repeat; apply the value once edits settle
+        self._ppqn_timer = QTimer(self)
+        self._ppqn_timer.setSingleShot(True)
+        self._ppqn_timer.setInterval(PPQN_DEBOUNCE_MS)
+        self._ppqn_timer.timeout.connect(self.apply_ppqn)
 
         self.out_dir_edit = QLineEdit()
         self.out_dir_edit.setPlaceholderText("(Same as input)")
         self.out_dir_edit.setReadOnly(True)
-        btn_choose_dir = QPushButton("Choose Output Dir")
-        btn_clear_dir = QPushButton("Clear")
+        self.btn_choose_dir = QPushButton("Choose Output Dir")
+        self.btn_clear_dir = QPushButton("Clear")
         self.overwrite_check = QCheckBox("Overwrite existing files")
 
         # NEW: export unsigned char hex array switch
@@ -343,14 +645,15 @@ class MidiPPQNPage(QWidget):
         btn_clear.clicked.connect(self.table.clear_files)
         btn_up.clicked.connect(self.table.move_up)
         btn_down.clicked.connect(self.table.move_down)
-        btn_convert.clicked.connect(self.table.convert_all)
+        btn_convert.clicked.connect(self.convert_all)
         btn_open_dir.clicked.connect(self.open_output_dir)
         btn_export_headers.clicked.connect(self.export_headers_only)
 
         self.ppqn_spin.valueChanged.connect(self.on_ppqn_changed)
-        btn_choose_dir.clicked.connect(self.choose_out_dir)
-        btn_clear_dir.clicked.connect(self.clear_out_dir)
+        self.btn_choose_dir.clicked.connect(self.choose_out_dir)
+        self.btn_clear_dir.clicked.connect(self.clear_out_dir)
         self.overwrite_check.stateChanged.connect(self.on_overwrite_changed)
+        self.table.converting_changed.connect(self.on_converting_changed)
         self.hex_check.stateChanged.connect(self.on_hex_changed)
         # Sync initial state
         self.on_hex_changed(self.hex_check.checkState())
@@ -372,8 +675,8 @@ class MidiPPQNPage(QWidget):
         bar2.addSpacing(16)
         bar2.addWidget(QLabel("Output Dir:"))
         bar2.addWidget(self.out_dir_edit, 1)
-        bar2.addWidget(btn_choose_dir)
-        bar2.addWidget(btn_clear_dir)
+        bar2.addWidget(self.btn_choose_dir)
+        bar2.addWidget(self.btn_clear_dir)
         bar2.addSpacing(16)
         bar2.addWidget(self.overwrite_check)
         bar2.addSpacing(16)
@@ -389,8 +692,26 @@ class MidiPPQNPage(QWidget):
         lay.addWidget(tips)
 
     # slots
+    def on_converting_changed(self, busy: bool):
+        """Output settings are locked while a batch runs; its rows keep their reserved outputs."""
+        for w in (self.ppqn_spin, self.btn_choose_dir, self.btn_clear_dir, self.overwrite_check):
+            w.setEnabled(not busy)
+
     def on_ppqn_changed(self, v: int):
-        self.table.set_target_ppqn(int(v))
+        self._ppqn_timer.start()
+
+    def apply_ppqn(self):
+        self._ppqn_timer.stop()
+        self.table.set_target_ppqn(self.ppqn_spin.value())
+
+    def flush_ppqn(self):
+        """Apply a spin edit still waiting on the debounce timer."""
+        if self._ppqn_timer.isActive():
+            self.apply_ppqn()
+
+    def convert_all(self):
+        self.flush_ppqn()
+        self.table.convert_all()
 
     def choose_out_dir(self):
         d = QFileDialog.getExistingDirectory(self, "Choose Output Directory", "")
@@ -409,8 +730,9 @@ class MidiPPQNPage(QWidget):
         self.table.set_export_hex(state == Qt.Checked)
 
     def export_headers_only(self):
+        self.flush_ppqn()
         # Export headers for selected rows (or all if none selected)
-        rows = sorted({idx.row() for idx in self.table.selectedIndexes()})
+        rows = self.table.selected_rows()
         if not rows:
             rows = list(range(len(self.table.items)))
         if not rows:
@@ -421,7 +743,7 @@ class MidiPPQNPage(QWidget):
         for r in rows:
             item = self.table.items[r]
             # Determine dst path as shown in table
-            dst = self.table.item(r, self.table.COL_OUTPUT).text()
+            dst = item.get("output", "")
             if not os.path.isfile(dst):
                 failed.append((r, "MID not found: " + dst))
                 continue
@@ -432,11 +754,11 @@ class MidiPPQNPage(QWidget):
                 header_path = os.path.join(folder, f"{base}_hex.h")
                 export_hex_header_from_file(dst, header_path, varname)
                 item["header"] = header_path
-                self.table.setItem(r, self.table.COL_HEADER, QTableWidgetItem(header_path))
+                self.table.update_row(r)
                 created.append(header_path)
             except Exception as e:
                 item["header"] = f"ERROR: {e}"
-                self.table.setItem(r, self.table.COL_HEADER, QTableWidgetItem(item["header"]))
+                self.table.update_row(r)
                 failed.append((r, str(e)))
         msg = []
         if created: